@@ -14,16 +14,20 @@ import inspect
 import logging
 import re
 import shutil
+import signal
+import time
 import traceback
+from dataclasses import dataclass
 from typing import Any
 from pathlib import Path
-from functools import partial
+from functools import lru_cache, partial
 
 from textual.app import App, ComposeResult
 from textual import events
 from textual.widgets import Footer
 from textual.widget import Widget
 from textual.binding import Binding
+from textual.color import Color
 from textual.css.query import NoMatches
 from rich.text import Text
 from rich.style import Style
@@ -36,10 +40,14 @@ from .agents import AgentOverrides, AgentProfile
 from .utils import (
     INIT_PROMPT,
     SYSTEM_PROMPT,
+    TRACE_LEVEL,
+    async_timeout,
+    json_dumps,
+    json_loads,
     load_prompts_from_config,
     log_file_path,
 )
-from .courier import ConsiliumCourier, CourierMessage, CourierHooks, JournalEntry
+from .courier import AgentMessage, ConsiliumCourier, CourierMessage, CourierHooks, JournalEntry
 from .session import SessionManager
 from .widgets import (
     ChatComposer, ChatLog, ConsiliumCommandProvider,
@@ -55,6 +63,42 @@ from .roles import RoleManager, Role
 from .backends import AgentBackendRegistry
 from .registry import AgentRegistry, AgentRegistryEvent
 
+# Error markers in non-JSON CLI output, matched in a single case-insensitive pass
+_ERROR_KW_RE = re.compile(
+    r"error[ :]|failed|exception|resource exhausted|non utf-8|json decode|status code",
+    re.IGNORECASE,
+)
+
+# Footer backgrounds for step mode on/off, parsed once
+_STEP_FOOTER_BG_ON = Color.parse("green")
+_STEP_FOOTER_BG_OFF = Color(38, 38, 38)  # Default dark gray
+
+# Composer commands that end the session
+_QUIT_COMMANDS = frozenset({'/exit', '/quit'})
+
+# User @mentions (priority) and @@mentions (private delivery)
+_COMBINED_MENTION_RE = re.compile(r"(@@?)(\w+(?:\.\w+)*)")
+
+# Courier-style context headers rendered in chat
+_CTX_ID_RE = re.compile(r"\[#(\d+)\]")
+_CTX_HEADER_BLOCK_RE = re.compile(r"(?:(?:from|to):[^\n]*(?:\n|\Z))+", re.IGNORECASE)
+_CTX_HEADER_LINE_RE = re.compile(r"^(from:|to:)", re.IGNORECASE | re.MULTILINE)
+
+
+@lru_cache(maxsize=None)
+def _header_token_pattern(token: str) -> re.Pattern[str]:
+    return re.compile(re.escape(token), re.IGNORECASE)
+
+
+@dataclass(slots=True)
+class HistoryEntry:
+    """Chat message kept in memory for reply previews."""
+
+    msg_id: int | str | None
+    author: str
+    text: str
+    reply_to: int | str | None = None
+
 
 class ParticipantsHeader(Widget):
     """Custom header widget displaying participants with colours."""
@@ -148,6 +192,13 @@ class ConsiliumAgentTUI(App):
 
     def __init__(self):
         self.logger = logging.getLogger('ConsiliumAgent')
+        # Bumped whenever agent membership or names change; validates name caches
+        self._agents_version: int = 0
+        self._display_name_cache: dict[str, tuple[int, str]] = {}
+        self._mention_lookup: dict[str, str] | None = None
+        self._mention_lookup_version: int = -1
+        # Bumped whenever anything baked into backend prompt prefixes changes
+        self._prompt_prefix_version = 0
         self.settings_path = Path.home() / ".consilium" / "settings.json"
         self._user_settings: dict[str, Any] = {}
         self._settings_loaded = False
@@ -156,6 +207,12 @@ class ConsiliumAgentTUI(App):
         self.user_avatar: str | None = None  # User's avatar emoji (stored globally)
         self.user_color: str | None = None  # User's preferred chat colour
         self._participants_header: ParticipantsHeader | None = None
+        # Main-screen widgets, cached in compose() to skip DOM queries on hot paths
+        self._chat_log: ChatLog | None = None
+        self._composer: ChatComposer | None = None
+        self._footer: ConsiliumFooter | None = None
+        self._footer_refresh_pending = False
+        self._last_footer_bg: Color | None = None
         self._pending_header_text: Text | None = None
         self._participant_order_ids: list[str] = []
         self.enable_prompt_editor_command: bool = False
@@ -166,7 +223,9 @@ class ConsiliumAgentTUI(App):
         self._shutdown_attempts = 0
         self._interrupt_requested = False
         self._background_tasks: list[asyncio.Task] = []
-        self._running_subprocesses: list[asyncio.subprocess.Process] = []
+        self._running_subprocesses: set[asyncio.subprocess.Process] = set()
+        # Per-agent long-lived stderr readers: agent -> (stream queue, drain task)
+        self._stderr_drains: dict[str, tuple[asyncio.Queue, asyncio.Task]] = {}
         self._shutdown_trigger: str | None = None
 
         # Load prompts into memory (already loaded in utils module)
@@ -174,6 +233,8 @@ class ConsiliumAgentTUI(App):
         self.system_prompt = SYSTEM_PROMPT
         # System prompt refresh period (will be loaded from settings)
         self.system_prompt_period = SYSTEM_PROMPT_PERIOD
+        # Send system prompts every turn so provider prefix caching always hits
+        self.prompt_caching_enabled = PROMPT_CACHING_ENABLED
         # Per-agent system prompts (workspace-specific overrides); populated later
         self.agent_prompts: dict[str, str] = {}
         self._agents_without_prompt: set[str] = set()
@@ -187,6 +248,7 @@ class ConsiliumAgentTUI(App):
         self.session_manager = SessionManager(Path.cwd())
         self.workspace_root = self.session_manager.workspace_path
         self._prompts_root: Path = self.session_manager.session_dir / "prompts"
+        self._prompt_exists_cache: dict[str, bool] = {}
         self.logger.trace(
             "ConsiliumAgentTUI:workspace paths set root=%s prompts_root=%s",
             self.workspace_root,
@@ -194,7 +256,7 @@ class ConsiliumAgentTUI(App):
         )
         self._asyncio_handler_installed = False
 
-        self.history = []  # For UI display only (not for prompts!)
+        self.history: list[HistoryEntry] = []  # For UI display only (not for prompts!)
         self.history_limit = 1000
 
         # Agent registry and backend registry
@@ -202,6 +264,7 @@ class ConsiliumAgentTUI(App):
         self.agent_registry = AgentRegistry(self.settings_path)
         self.agent_profiles: dict[str, AgentProfile] = {}
         self.agents: dict[str, dict[str, Any]] = {}
+        self._agents_lc: dict[str, str] = {}  # lowercase agent key -> agent key
         self._registry_listener_task: asyncio.Task | None = None
         self._load_agents_from_registry()
         self.logger.trace("ConsiliumAgentTUI:agent registry initialized %s", list(self.agents.keys()))
@@ -216,6 +279,7 @@ class ConsiliumAgentTUI(App):
             get_display_name=self.get_agent_display_name,
             is_silent_response_text=self._is_silent_response_text,
             run_backend=self.run_agent_backend,
+            get_agents_version=lambda: self._agents_version,
         )
         last_msg_id = self.session_manager.get_last_message_id()
         if last_msg_id:
@@ -235,16 +299,25 @@ class ConsiliumAgentTUI(App):
         self.input_history: list[str] = []
         self.input_history_index: int = -1
         self.input_history_limit: int = 300
+        # Input history is written off the event loop, one flush per burst of inputs
+        self._input_history_flush_pending = False
+        self._input_history_lock = asyncio.Lock()
         self.logger.trace("ConsiliumAgentTUI:input history initialized")
 
+        # Agent session saves coalesced per agent_id and written off the event loop
+        self._pending_session_saves: dict[str, tuple[str, int]] = {}
+        self._session_save_lock = asyncio.Lock()
+
         # Step-by-step mode
         self.step_by_step_mode: bool = False
         self.waiting_for_step: bool = False
-        self.step_event: asyncio.Event = asyncio.Event()
-        self.step_event.set()  # Initially not waiting
+        # Generation counter: waiters resume once it moves past the value they saw
+        self._step_gen: int = 0
+        self._step_cond: asyncio.Condition = asyncio.Condition()
 
-        # Status bar auto-clear timer
+        # Status bar auto-clear: deadline checked by one long-lived interval timer
         self._status_clear_timer = None
+        self._status_clear_deadline: float | None = None
         self._status_bar_widget: AnimatedStatusBar | None = None
         self._pending_status_text: str | None = None
 
@@ -265,7 +338,7 @@ class ConsiliumAgentTUI(App):
         self.load_persisted_sessions()
         self._load_input_history()
         self.logger.trace("ConsiliumAgentTUI:initialization steps complete")
-        self.logger.debug(f"ConsiliumAgentTUI initialized with agents: {list(self.agents.keys())}")
+        self.logger.debug("ConsiliumAgentTUI initialized with agents: %s", list(self.agents.keys()))
 
     # ------------------------------------------------------------------
     # Agent registry helpers
@@ -282,14 +355,25 @@ class ConsiliumAgentTUI(App):
         self._agent_name_map = {}
         self._agent_id_to_name = {}
         self.agents.clear()
+        self._agents_lc.clear()
         self.agent_locks = {}
         self._participant_order_ids = []
 
         for profile in profiles:
             self._register_profile(profile, runtime_state.get(profile.agent_id))
 
+        self._bump_agents_version()
         self._refresh_participants_ui()
 
+    def _bump_agents_version(self) -> None:
+        """Invalidate caches derived from agent names and membership."""
+        self._agents_version += 1
+        self._invalidate_prompt_prefixes()
+
+    def _invalidate_prompt_prefixes(self) -> None:
+        """Force backends to rebuild cached identity/participants/system prompt prefixes."""
+        self._prompt_prefix_version += 1
+
     def _capture_agent_runtime(self) -> dict[str, dict[str, Any]]:
         """Capture runtime-only state for existing agents."""
         runtime: dict[str, dict[str, Any]] = {}
@@ -388,6 +472,7 @@ class ConsiliumAgentTUI(App):
 
         if existing_key and existing_key in self.agents:
             current_entry = self.agents.pop(existing_key)
+            self._forget_agent_key(existing_key)
             lock = self.agent_locks.pop(existing_key, None)
             self._agent_name_map.pop(existing_key, None)
             self._agent_id_to_name.pop(agent_id, None)
@@ -412,6 +497,7 @@ class ConsiliumAgentTUI(App):
             self.agent_locks[key] = lock
 
         self.agents[key] = entry
+        self._agents_lc[key.lower()] = key
         self._agent_name_map[key] = agent_id
         self._agent_id_to_name[agent_id] = key
         if agent_id not in self._participant_order_ids:
@@ -427,6 +513,7 @@ class ConsiliumAgentTUI(App):
             else:
                 courier.mark_participant_disabled(key)
 
+        self._bump_agents_version()
         self._apply_role_prompt(key, entry.get('role_id'), persist=False, force=False)
         return key
 
@@ -437,7 +524,7 @@ class ConsiliumAgentTUI(App):
             self.agent_locks[agent_name] = lock
         return lock
 
-    async def run_agent_backend(self, agent_name: str, message: str, is_init: bool, skip_log: bool) -> Any:
+    async def run_agent_backend(self, agent_name: str, message: AgentMessage, is_init: bool, skip_log: bool) -> Any:
         entry = self.agents.get(agent_name)
         if not entry:
             self.logger.error("Attempted to run backend for unknown agent '%s'", agent_name)
@@ -461,24 +548,32 @@ class ConsiliumAgentTUI(App):
             skip_log=skip_log,
         )
 
+    def _forget_agent_key(self, key: str) -> None:
+        """Drop ``key`` from the lowercase agents view unless another agent owns the slot."""
+        if self._agents_lc.get(key.lower()) == key:
+            del self._agents_lc[key.lower()]
+
     def _remove_agent_by_id(self, agent_id: str) -> None:
         key = self._agent_id_to_name.pop(agent_id, None)
         if not key:
             return
 
         entry = self.agents.pop(key, None)
+        self._forget_agent_key(key)
         self._agent_name_map.pop(key, None)
+        self._bump_agents_version()
         lock = self.agent_locks.pop(key, None)
         process = entry.get('process') if entry else None
         if agent_id in self._participant_order_ids:
             self._participant_order_ids.remove(agent_id)
         if process is not None and getattr(process, 'returncode', None) is None:
             try:
-                process.kill()
-                self.logger.debug("Process.kill() called for removed agent %s", key)
+                self._kill_process_group(process)
+                self._close_process_pipes(process)
+                self.logger.debug("Process group killed for removed agent %s", key)
             except Exception as exc:  # pragma: no cover - safety
                 self.logger.warning("Failed to kill process for removed agent %s: %s", key, exc)
-            self._running_subprocesses = [p for p in self._running_subprocesses if p is not process]
+            self._running_subprocesses.discard(process)
 
         courier = getattr(self, "courier", None)
         if courier:
@@ -584,10 +679,131 @@ class ConsiliumAgentTUI(App):
     async def _create_subprocess_exec(self, *args, **kwargs):
         """Create subprocess and track it for shutdown cleanup."""
         process = await asyncio.create_subprocess_exec(*args, **kwargs)
-        self._running_subprocesses.append(process)
+        self._running_subprocesses.add(process)
         self.logger.trace("ConsiliumAgentTUI:create_subprocess pid=%s total=%d", getattr(process, 'pid', None), len(self._running_subprocesses))
         return process
 
+    async def _drain_stderr(self, queue: asyncio.Queue) -> None:
+        """Read each queued stderr stream to EOF and hand its bytes to the waiting call."""
+        while True:
+            reader, result = await queue.get()
+            try:
+                data = await reader.read()
+            except Exception as exc:
+                if not result.done():
+                    result.set_exception(exc)
+            else:
+                if not result.done():
+                    result.set_result(data)
+
+    def _queue_stderr(self, agent: str, reader: asyncio.StreamReader) -> asyncio.Future:
+        """Hand a subprocess stderr stream to the agent's drain; resolves to its contents."""
+        entry = self._stderr_drains.get(agent)
+        if entry is None or entry[1].done():
+            queue: asyncio.Queue = asyncio.Queue()
+            entry = (queue, asyncio.create_task(self._drain_stderr(queue)))
+            self._stderr_drains[agent] = entry
+        result = asyncio.get_running_loop().create_future()
+        entry[0].put_nowait((reader, result))
+        return result
+
+    def _release_stderr_drain(self, agent: str, result: asyncio.Future | None) -> None:
+        """Drop the agent's drain if it may still be blocked on an abandoned stream."""
+        if result is None or (result.done() and not result.cancelled()):
+            return
+        result.cancel()
+        entry = self._stderr_drains.pop(agent, None)
+        if entry is not None:
+            entry[1].cancel()
+
+    async def _kill_and_wait(self, agent: str, process) -> None:
+        """Kill an agent CLI process that is still running and reap it."""
+        if not process or process.returncode is not None:
+            return
+        try:
+            self.logger.warning("[%s] Killing leftover process", agent)
+            self._kill_process_group(process)
+            await self._reap_killed_process(process)
+        except (ProcessLookupError, OSError) as e:
+            self.logger.debug("[%s] Process already terminated in cleanup: %s", agent, e)
+
+    async def _stop_process_groups(self, processes, *, grace: bool = True) -> None:
+        """SIGTERM each agent CLI process group, then SIGKILL what is left and reap it.
+
+        The group is killed even when the CLI itself already exited, because tool
+        subprocesses it spawned may have ignored SIGTERM. Waits are bounded.
+        """
+        processes = list(processes)
+        for proc in processes:
+            if proc.returncode is None:
+                try:
+                    self._terminate_process_group(proc)
+                except ProcessLookupError:
+                    pass  # Process already terminated
+
+        if grace:
+            await asyncio.sleep(SHUTDOWN_GRACE_PERIOD)
+
+        running = []
+        for proc in processes:
+            try:
+                self._kill_process_group(proc)
+            except (ProcessLookupError, OSError):
+                pass
+            if proc.returncode is None:
+                running.append(proc)
+        if running:
+            await asyncio.gather(*(self._reap_killed_process(proc) for proc in running))
+
+    async def _reap_killed_process(self, process, timeout: float = PROCESS_REAP_TIMEOUT) -> bool:
+        """Close a killed process's pipes and wait up to ``timeout`` for it; False on timeout."""
+        # Grandchildren may still hold stdio open; don't let that keep us waiting
+        self._close_process_pipes(process)
+        try:
+            async with async_timeout(timeout):
+                await process.wait()
+        except asyncio.TimeoutError:
+            self.logger.warning("Process PID %s did not terminate in time", process.pid)
+            return False
+        self.logger.debug("Killed subprocess PID %s", process.pid)
+        return True
+
+    @staticmethod
+    def _signal_process_group(process, sig) -> bool:
+        """Send ``sig`` to the process group an agent CLI leads; False if that is not possible."""
+        if sig is None or not hasattr(os, "killpg"):
+            return False
+        try:
+            os.killpg(process.pid, sig)
+        except (ProcessLookupError, PermissionError):
+            return False
+        return True
+
+    @classmethod
+    def _terminate_process_group(cls, process) -> None:
+        """SIGTERM an agent CLI together with its process group (it leads its own session)."""
+        if not cls._signal_process_group(process, signal.SIGTERM) and process.returncode is None:
+            process.terminate()
+
+    @classmethod
+    def _kill_process_group(cls, process) -> None:
+        """SIGKILL an agent CLI together with its process group (it leads its own session)."""
+        if not cls._signal_process_group(process, getattr(signal, "SIGKILL", None)) and process.returncode is None:
+            process.kill()
+
+    @staticmethod
+    def _close_process_pipes(process) -> None:
+        """Close the stdio pipe transports of a killed process."""
+        for stream in (process.stdin, process.stdout, process.stderr):
+            if stream is None:
+                continue
+            transport = getattr(stream, "transport", None) or getattr(stream, "_transport", None)
+            if transport is not None:
+                try:
+                    transport.close()
+                except Exception:
+                    pass
+
     def _get_active_participants(self) -> str:
         """
         Generate dynamic participant list based on currently enabled agents.
@@ -699,6 +915,15 @@ class ConsiliumAgentTUI(App):
         self._shutting_down = True
         self._shutdown_attempts += 1
         hard = (self._shutdown_attempts > 1)
+        # Wait for an in-flight worker write, then persist anything newer
+        async with self._input_history_lock:
+            if self._input_history_flush_pending:
+                self._save_input_history()
+        # Same for agent sessions: an older in-flight batch must land before newer entries
+        async with self._session_save_lock:
+            if self._pending_session_saves:
+                self._save_pending_agent_sessions()
+        await self._notify_step_waiters()
 
         # Capture caller information for diagnostics
         import traceback
@@ -716,17 +941,18 @@ class ConsiliumAgentTUI(App):
             origin_desc,
         )
 
-        # Detailed call stack for deep debugging (TRACE level only)
-        formatted_stack = "".join(traceback.format_list(stack_summary[:-1]))
-        self.logger.debug("Shutdown call stack trimmed:\n%s", formatted_stack)
-        self.logger.trace("Shutdown stack raw=%r", formatted_stack)
+        # Detailed call stack for deep debugging (DEBUG/TRACE levels only)
+        if self.logger.isEnabledFor(logging.DEBUG):
+            formatted_stack = "".join(traceback.format_list(stack_summary[:-1]))
+            self.logger.debug("Shutdown call stack trimmed:\n%s", formatted_stack)
+            self.logger.trace("Shutdown stack raw=%r", formatted_stack)
 
         # Allow background tasks to complete gracefully
         await self._drain_background_tasks()
 
         # Cancel any lingering background tasks
         if self._background_tasks:
-            self.logger.debug(f"Cancelling {len(self._background_tasks)} remaining background tasks")
+            self.logger.debug("Cancelling %d remaining background tasks", len(self._background_tasks))
             for task in list(self._background_tasks):
                 if not task.done():
                     task.cancel()
@@ -734,36 +960,24 @@ class ConsiliumAgentTUI(App):
             await asyncio.gather(*self._background_tasks, return_exceptions=True)
             self._background_tasks.clear()
 
+        # Stop idle stderr drains
+        for _queue, drain in self._stderr_drains.values():
+            drain.cancel()
+        self._stderr_drains.clear()
+
         # Terminate all running subprocesses
         if self._running_subprocesses:
-            self.logger.debug(f"Terminating {len(self._running_subprocesses)} subprocesses")
-            for proc in list(self._running_subprocesses):
-                if proc.returncode is None:
-                    try:
-                        proc.terminate()
-                    except ProcessLookupError:
-                        pass  # Process already terminated
-
+            self.logger.debug("Terminating %d subprocesses", len(self._running_subprocesses))
             # Grace period for soft shutdown (skip in hard mode)
-            if not hard:
-                await asyncio.sleep(SHUTDOWN_GRACE_PERIOD)
-
-            # Kill any remaining processes
-            for proc in list(self._running_subprocesses):
-                if proc.returncode is None:
-                    try:
-                        proc.kill()
-                        # Wait with timeout to prevent hanging on unresponsive processes
-                        try:
-                            await asyncio.wait_for(proc.wait(), timeout=2.0)
-                            self.logger.debug(f"Killed subprocess PID {proc.pid}")
-                        except asyncio.TimeoutError:
-                            self.logger.warning(f"Process PID {proc.pid} did not terminate in time")
-                    except ProcessLookupError:
-                        pass
-
+            await self._stop_process_groups(self._running_subprocesses, grace=not hard)
             self._running_subprocesses.clear()
 
+        # Turns that finished while shutting down may have queued saves after the
+        # first flush; no backend can run now, so this one catches the rest
+        async with self._session_save_lock:
+            if self._pending_session_saves:
+                self._save_pending_agent_sessions()
+
         self.logger.info("Shutdown complete")
 
     async def action_interrupt_conversation(self):
@@ -773,27 +987,10 @@ class ConsiliumAgentTUI(App):
 
         self._interrupt_requested = True
         self.logger.info("Interrupting conversation...")
+        await self._notify_step_waiters()
 
-        # Kill all subprocesses
-        for proc in list(self._running_subprocesses):
-            if proc.returncode is None:
-                try:
-                    proc.terminate()
-                except ProcessLookupError:
-                    pass
-
-        # Grace period for soft termination
-        await asyncio.sleep(SHUTDOWN_GRACE_PERIOD)
-
-        # Kill any remaining processes
-        for proc in list(self._running_subprocesses):
-            if proc.returncode is None:
-                try:
-                    proc.kill()
-                    await proc.wait()
-                    self.logger.debug(f"Killed subprocess PID {proc.pid}")
-                except ProcessLookupError:
-                    pass
+        # Kill all subprocesses, with their process groups
+        await self._stop_process_groups(self._running_subprocesses)
 
         # Cancel all background tasks
         await self._drain_background_tasks()
@@ -825,7 +1022,7 @@ class ConsiliumAgentTUI(App):
         if remember and not self._rebuilding_chat:
             self._chat_entries.append((content, {}))
 
-        chat_log = self.query_one("#chat-log", ChatLog)
+        chat_log = self._chat_log or self.query_one("#chat-log", ChatLog)
         # Auto-detect: only scroll if user is already at bottom
         should_scroll = chat_log.is_vertical_scroll_end
         chat_log.write(content, scroll_end=should_scroll)
@@ -836,7 +1033,7 @@ class ConsiliumAgentTUI(App):
             return  # Prevent recursive rebuilds
 
         try:
-            chat_log = self.query_one("#chat-log", ChatLog)
+            chat_log = self._chat_log or self.query_one("#chat-log", ChatLog)
         except NoMatches:
             self.logger.debug("Chat log not available for rebuild")
             return
@@ -866,7 +1063,7 @@ class ConsiliumAgentTUI(App):
 
     def setup_workspace(self):
         """Create shared workspace"""
-        self.logger.info(f"Workspace ready: {self.workspace_root.absolute()}")
+        self.logger.info("Workspace ready: %s", self.workspace_root.absolute())
         self.logger.trace(
             "ConsiliumAgentTUI:prompt storage ready at %s",
             self._prompts_root,
@@ -884,7 +1081,7 @@ class ConsiliumAgentTUI(App):
             if agent_data.get('session_id'):
                 agent_config['session_id'] = agent_data['session_id']
                 agent_config['message_count'] = agent_data.get('message_count', 0)
-                self.logger.info(f"{agent_display_name} session restored: {agent_data['session_id']}")
+                self.logger.info("%s session restored: %s", agent_display_name, agent_data['session_id'])
 
         self.logger.trace("ConsiliumAgentTUI:load_persisted_sessions complete")
 
@@ -911,7 +1108,7 @@ class ConsiliumAgentTUI(App):
                         if isinstance(entry, str) and entry.strip() and not entry.strip().startswith('/')
                     ]
                     self.input_history = filtered[-self.input_history_limit:]
-                    self.logger.debug(f"Loaded {len(self.input_history)} input history entries")
+                    self.logger.debug("Loaded %d input history entries", len(self.input_history))
                     self.logger.trace("ConsiliumAgentTUI:input history entries loaded count=%d", len(self.input_history))
                 else:
                     self.logger.warning("Invalid input history format, starting fresh")
@@ -919,19 +1116,63 @@ class ConsiliumAgentTUI(App):
             self.logger.exception("Failed to load input history")
 
     def _save_input_history(self):
-        """Save input history to workspace/input_history.json"""
+        """Save input history to workspace/input_history.json (caller holds _input_history_lock)"""
+        self._input_history_flush_pending = False
+        # Keep only last N entries to prevent file growth
+        self._write_input_history(self.input_history[-self.input_history_limit:])
+
+    async def _flush_input_history(self) -> None:
+        """Write pending input history in a worker thread."""
+        async with self._input_history_lock:
+            if not self._input_history_flush_pending:
+                return
+            self._input_history_flush_pending = False
+            history_to_save = self.input_history[-self.input_history_limit:]
+            await asyncio.to_thread(self._write_input_history, history_to_save)
+
+    def _write_input_history(self, history_to_save: list[str]) -> None:
+        """Write the given entries to workspace/input_history.json"""
         history_file = self.input_history_path
 
+        tmp_file = history_file.with_suffix('.json.tmp')
         try:
             history_file.parent.mkdir(parents=True, exist_ok=True)
-            # Keep only last N entries to prevent file growth
-            history_to_save = self.input_history[-self.input_history_limit:]
-            with history_file.open('w', encoding='utf-8') as f:
+            with tmp_file.open('w', encoding='utf-8') as f:
                 json.dump(history_to_save, f, ensure_ascii=False, indent=2)
-            self.logger.debug(f"Saved {len(history_to_save)} input history entries")
+            # Atomic swap so an interrupted write never leaves truncated JSON behind
+            os.replace(tmp_file, history_file)
+            self.logger.debug("Saved %d input history entries", len(history_to_save))
             self.logger.trace("ConsiliumAgentTUI:input history saved count=%d", len(history_to_save))
         except Exception:
             self.logger.exception("Failed to save input history")
+            tmp_file.unlink(missing_ok=True)
+
+    def queue_agent_session_save(self, agent_id: str, session_id: str, message_count: int) -> None:
+        """Schedule persisting an agent session; repeated saves before the flush collapse."""
+        schedule = not self._pending_session_saves
+        self._pending_session_saves[agent_id] = (session_id, message_count)
+        if schedule:
+            self.call_later(self._flush_agent_sessions)
+
+    def _take_pending_agent_sessions(self) -> list[tuple[str, str, int]]:
+        pending = [(agent_id, *data) for agent_id, data in self._pending_session_saves.items()]
+        self._pending_session_saves.clear()
+        return pending
+
+    def _save_pending_agent_sessions(self) -> None:
+        """Write queued agent sessions synchronously (shutdown; caller holds _session_save_lock)."""
+        self._write_agent_sessions(self._take_pending_agent_sessions())
+
+    async def _flush_agent_sessions(self) -> None:
+        """Write queued agent sessions in a worker thread."""
+        async with self._session_save_lock:
+            pending = self._take_pending_agent_sessions()
+            if pending:
+                await asyncio.to_thread(self._write_agent_sessions, pending)
+
+    def _write_agent_sessions(self, pending: list[tuple[str, str, int]]) -> None:
+        for agent_id, session_id, message_count in pending:
+            self.session_manager.save_agent_session(agent_id, session_id, message_count)
 
     def get_history_prev(self) -> str | None:
         """Get previous message from input history"""
@@ -976,8 +1217,10 @@ class ConsiliumAgentTUI(App):
         # Reset navigation pointer so Ctrl+Up starts from the newest entry
         self.input_history_index = -1
 
-        self._save_input_history()
-        self.logger.trace(f"Input remembered (total={len(self.input_history)})")
+        if not self._input_history_flush_pending:
+            self._input_history_flush_pending = True
+            self.call_later(self._flush_input_history)
+        self.logger.trace("Input remembered (total=%d)", len(self.input_history))
 
     def get_previous_input(self) -> str | None:
         """Expose previous input for the composer (Ctrl+Up)."""
@@ -999,7 +1242,7 @@ class ConsiliumAgentTUI(App):
             try:
                 with self.settings_path.open('r', encoding='utf-8') as handle:
                     settings = json.load(handle)
-                self.logger.debug(f"Loaded settings from {self.settings_path}")
+                self.logger.debug("Loaded settings from %s", self.settings_path)
                 self.logger.trace("ConsiliumAgentTUI:user settings file read")
                 if 'members' in settings:
                     # Keep members management isolated in AgentRegistry; avoid stale snapshots
@@ -1011,7 +1254,7 @@ class ConsiliumAgentTUI(App):
 
         theme = settings.get('theme')
         if isinstance(theme, str):
-            self.logger.debug(f"Applying saved theme: {theme}")
+            self.logger.debug("Applying saved theme: %s", theme)
             self._suspend_theme_watch = True
             try:
                 self.theme = theme
@@ -1043,9 +1286,10 @@ class ConsiliumAgentTUI(App):
         user_nickname = settings.get('user_nickname')
         if isinstance(user_nickname, str) and user_nickname.strip():
             self.user_nickname = user_nickname.strip()
-            self.logger.debug(f"Loaded user nickname: {self.user_nickname}")
+            self.logger.debug("Loaded user nickname: %s", self.user_nickname)
         else:
             self.user_nickname = None
+        self._bump_agents_version()
 
         user_avatar = settings.get('user_avatar')
         if isinstance(user_avatar, str) and user_avatar.strip():
@@ -1074,6 +1318,11 @@ class ConsiliumAgentTUI(App):
             self.system_prompt_period = system_period
             self.logger.debug("Loaded system prompt period: %s", system_period)
 
+        prompt_caching = settings.get('prompt_caching_enabled')
+        if isinstance(prompt_caching, bool):
+            self.prompt_caching_enabled = prompt_caching
+            self.logger.debug("Loaded prompt caching flag: %s", prompt_caching)
+
         self._user_settings = settings
         self._settings_loaded = True
 
@@ -1112,8 +1361,7 @@ class ConsiliumAgentTUI(App):
             del self._user_settings['user_color']
 
         # Save system prompt period
-        if hasattr(self, 'system_prompt_period'):
-            self._user_settings['system_prompt_period'] = self.system_prompt_period
+        self._user_settings['system_prompt_period'] = self.system_prompt_period
 
         try:
             current_settings: dict[str, Any] = {}
@@ -1137,7 +1385,7 @@ class ConsiliumAgentTUI(App):
             self.settings_path.parent.mkdir(parents=True, exist_ok=True)
             with self.settings_path.open('w', encoding='utf-8') as handle:
                 json.dump(merged, handle, indent=2, ensure_ascii=False)
-            self.logger.debug(f"Settings saved to {self.settings_path}")
+            self.logger.debug("Settings saved to %s", self.settings_path)
             self.logger.trace("ConsiliumAgentTUI:user settings saved")
         except Exception as exc:
             self.logger.exception("Failed to save settings")
@@ -1151,7 +1399,7 @@ class ConsiliumAgentTUI(App):
             return
 
         self._user_settings['theme'] = theme
-        self.logger.info(f"Theme changed to '{theme}'")
+        self.logger.info("Theme changed to '%s'", theme)
         self._save_user_settings()
 
     def is_agent_enabled(self, agent_name: str) -> bool:
@@ -1165,23 +1413,24 @@ class ConsiliumAgentTUI(App):
         """Enable or disable agent participation."""
         agent = self.agents.get(agent_name)
         if not agent:
-            self.logger.warning(f"Attempted to toggle unknown agent '{agent_name}'")
+            self.logger.warning("Attempted to toggle unknown agent '%s'", agent_name)
             return
 
         current = bool(agent.get('enabled', True))
         if current == enabled:
-            self.logger.debug(f"{agent_name} already {('enabled' if enabled else 'disabled')}, no change needed")
+            self.logger.debug("%s already %s, no change needed", agent_name, ('enabled' if enabled else 'disabled'))
             return
 
         agent_id = agent.get('agent_id')
         profile = self.agent_profiles.get(agent_id) if agent_id else None
         agent['enabled'] = enabled
+        self._invalidate_prompt_prefixes()
         if profile:
             profile.overrides.enabled = enabled
 
         state = "enabled" if enabled else "disabled"
-        self.logger.info(f"{agent_name} has been {state} (old={current}, new={enabled})")
-        self.logger.debug(f"Current agent states: {[(name, cfg.get('enabled')) for name, cfg in self.agents.items()]}")
+        self.logger.info("%s has been %s (old=%s, new=%s)", agent_name, state, current, enabled)
+        self.logger.debug("Current agent states: %s", [(name, cfg.get('enabled')) for name, cfg in self.agents.items()])
 
         if self.courier:
             if enabled:
@@ -1212,28 +1461,26 @@ class ConsiliumAgentTUI(App):
             if process.returncode is None:
                 try:
                     pid = process.pid
-                    self.logger.info(f"Killing running process for {agent_name} (PID: {pid})")
+                    self.logger.info("Killing running process for %s (PID: %s)", agent_name, pid)
                 except (AttributeError, ProcessLookupError):
-                    self.logger.debug(f"Process for {agent_name} already terminated (no PID)")
+                    self.logger.debug("Process for %s already terminated (no PID)", agent_name)
                     pid = None
 
                 try:
-                    process.kill()
-                    self.logger.debug(f"Process.kill() called for {agent_name}")
+                    self._kill_process_group(process)
+                    self._close_process_pipes(process)
+                    self.logger.debug("Process group killed for %s", agent_name)
                 except ProcessLookupError:
-                    self.logger.debug(f"Process for {agent_name} already terminated during kill")
+                    self.logger.debug("Process for %s already terminated during kill", agent_name)
                 except OSError as e:
-                    self.logger.warning(f"OSError killing process for {agent_name}: {e}")
+                    self.logger.warning("OSError killing process for %s: %s", agent_name, e)
 
                 if process in self._running_subprocesses:
-                    try:
-                        self._running_subprocesses.remove(process)
-                        self.logger.debug(f"Removed {agent_name} process from running subprocesses list")
-                    except ValueError:
-                        pass
+                    self._running_subprocesses.discard(process)
+                    self.logger.debug("Removed %s process from running subprocesses list", agent_name)
             agent['process'] = None
         except Exception as e:
-            self.logger.error(f"Unexpected error killing process for {agent_name}: {e}", exc_info=True)
+            self.logger.error("Unexpected error killing process for %s: %s", agent_name, e, exc_info=True)
             agent['process'] = None
 
     def get_agent_nickname(self, agent_name: str) -> str | None:
@@ -1248,7 +1495,7 @@ class ConsiliumAgentTUI(App):
         """Set agent nickname and persist via registry."""
         agent = self.agents.get(agent_name)
         if not agent:
-            self.logger.warning(f"Attempted to set nickname for unknown agent '{agent_name}'")
+            self.logger.warning("Attempted to set nickname for unknown agent '%s'", agent_name)
             return
 
         if nickname is not None:
@@ -1257,6 +1504,7 @@ class ConsiliumAgentTUI(App):
         agent_id = agent.get('agent_id')
         profile = self.agent_profiles.get(agent_id) if agent_id else None
         agent['nickname'] = nickname
+        self._bump_agents_version()
         if profile:
             profile.overrides.nickname = nickname
             self.logger.trace(
@@ -1274,7 +1522,7 @@ class ConsiliumAgentTUI(App):
             )
 
         self._refresh_participants_ui()
-        self.logger.info(f"{agent_name} nickname set to: {nickname}")
+        self.logger.info("%s nickname set to: %s", agent_name, nickname)
 
     def get_agent_avatar(self, agent_name: str) -> str | None:
         """Return current avatar for agent (or None if unknown)."""
@@ -1350,6 +1598,7 @@ class ConsiliumAgentTUI(App):
 
         # Update in memory
         self.user_nickname = nickname
+        self._bump_agents_version()
 
         # Persist to settings
         self._save_user_settings()
@@ -1357,7 +1606,7 @@ class ConsiliumAgentTUI(App):
         # Update title to reflect new nickname
         self._refresh_participants_ui()
 
-        self.logger.info(f"User nickname set to: {nickname}")
+        self.logger.info("User nickname set to: %s", nickname)
 
     def get_user_avatar(self) -> str:
         """Return avatar emoji for the local user."""
@@ -1404,6 +1653,15 @@ class ConsiliumAgentTUI(App):
 
     def get_agent_display_name(self, agent_name: str) -> str:
         """Get display name (nickname if set, otherwise canonical name). Works for both agents and User."""
+        cached = self._display_name_cache.get(agent_name)
+        if cached is not None and cached[0] == self._agents_version:
+            return cached[1]
+        display_name = self._resolve_display_name(agent_name)
+        self._display_name_cache[agent_name] = (self._agents_version, display_name)
+        return display_name
+
+    def _resolve_display_name(self, agent_name: str) -> str:
+        """Compute display name without consulting the cache."""
         # Special case: User nickname
         if agent_name == "User":
             user_nick = self.get_user_nickname()
@@ -1673,7 +1931,7 @@ class ConsiliumAgentTUI(App):
     def set_agent_role(self, agent_name: str, role_id: str | None) -> None:
         agent = self.agents.get(agent_name)
         if not agent:
-            self.logger.warning(f"Attempted to assign role to unknown agent '{agent_name}'")
+            self.logger.warning("Attempted to assign role to unknown agent '%s'", agent_name)
             return
 
         new_role_id = role_id or None
@@ -1681,14 +1939,14 @@ class ConsiliumAgentTUI(App):
         if new_role_id:
             role = self.role_manager.get_role(new_role_id)
             if role is None:
-                self.logger.warning(f"Attempted to assign unknown role '{new_role_id}' to {agent_name}")
+                self.logger.warning("Attempted to assign unknown role '%s' to %s", new_role_id, agent_name)
                 new_role_id = None
             else:
                 role_name = role.name
 
         current_role = agent.get('role_id')
         if current_role == new_role_id:
-            self.logger.debug(f"{agent_name} role unchanged ({new_role_id})")
+            self.logger.debug("%s role unchanged (%s)", agent_name, new_role_id)
             return
 
         agent['role_id'] = new_role_id
@@ -1711,9 +1969,9 @@ class ConsiliumAgentTUI(App):
             )
 
         if new_role_id is None:
-            self.logger.info(f"{agent_name} role cleared")
+            self.logger.info("%s role cleared", agent_name)
         else:
-            self.logger.info(f"{agent_name} role set to {role_name} ({new_role_id})")
+            self.logger.info("%s role set to %s (%s)", agent_name, role_name, new_role_id)
 
         self._apply_role_prompt(agent_name, new_role_id, persist=False, force=True)
         self._save_user_settings()
@@ -1768,7 +2026,7 @@ class ConsiliumAgentTUI(App):
     def _get_chat_log(self) -> ChatLog | None:
         """Safely return chat log widget if present."""
         try:
-            return self.query_one(ChatLog)
+            return self._chat_log or self.query_one(ChatLog)
         except NoMatches:
             self.logger.debug("Chat log not available for UI update")
             return None
@@ -1780,7 +2038,30 @@ class ConsiliumAgentTUI(App):
 
     def agent_prompt_exists(self, agent_name: str) -> bool:
         """Return True if workspace-specific prompt file exists for agent."""
-        return self._get_agent_prompt_file(agent_name).exists()
+        exists = self._prompt_exists_cache.get(agent_name)
+        if exists is None:
+            exists = self._get_agent_prompt_file(agent_name).exists()
+            self._prompt_exists_cache[agent_name] = exists
+        return exists
+
+    def agent_prompt_entries(self) -> list[tuple[str, bool]]:
+        """Return (agent_name, has_custom_prompt) for every agent, in roster order.
+
+        Uncached names are settled with one directory listing of the prompts root;
+        only agents that have a prompt directory still need a stat of their file.
+        """
+        cache = self._prompt_exists_cache
+        if any(name not in cache for name in self.agents):
+            try:
+                with os.scandir(self._prompts_root) as entries:
+                    prompt_dirs = {entry.name for entry in entries if entry.is_dir()}
+            except OSError:
+                prompt_dirs = set()
+            for name in self.agents:
+                if name not in cache and name.lower() not in prompt_dirs:
+                    cache[name] = False
+        prompt_exists = self.agent_prompt_exists
+        return [(name, prompt_exists(name)) for name in self.agents]
 
     def _ensure_agent_prompt_dir(self, agent_name: str) -> Path:
         """Ensure directory for agent prompt exists and return it."""
@@ -1801,9 +2082,9 @@ class ConsiliumAgentTUI(App):
             self.set_agent_system_prompt(agent_name, text, persist=False)
             loaded += 1
             prompt_path = self._get_agent_prompt_file(agent_name)
-            self.logger.info(f"Loaded workspace prompt for {agent_name} from {prompt_path}")
+            self.logger.info("Loaded workspace prompt for %s from %s", agent_name, prompt_path)
         if loaded:
-            self.logger.debug(f"Workspace prompts loaded: {loaded}")
+            self.logger.debug("Workspace prompts loaded: %s", loaded)
         self.logger.trace("ConsiliumAgentTUI:workspace prompts load finished count=%d", loaded)
 
     def _load_agent_prompt_from_disk(self, agent_name: str) -> str | None:
@@ -1814,35 +2095,37 @@ class ConsiliumAgentTUI(App):
         try:
             text = prompt_path.read_text(encoding='utf-8')
         except Exception:
-            self.logger.exception(f"Failed to read prompt for {agent_name} ({prompt_path})")
+            self.logger.exception("Failed to read prompt for %s (%s)", agent_name, prompt_path)
             return None
         if not text.strip():
-            self.logger.info(f"Workspace prompt for {agent_name} is empty, removing file")
+            self.logger.info("Workspace prompt for %s is empty, removing file", agent_name)
+            self._prompt_exists_cache.pop(agent_name, None)
             try:
                 prompt_path.unlink()
             except Exception:
-                self.logger.exception(f"Failed to remove empty prompt for {agent_name}")
+                self.logger.exception("Failed to remove empty prompt for %s", agent_name)
             return None
         return text
 
     def _save_agent_prompt_to_disk(self, agent_name: str, prompt: str | None) -> None:
         """Persist prompt text to disk (or remove file if text is empty)."""
         prompt_path = self._get_agent_prompt_file(agent_name)
+        self._prompt_exists_cache.pop(agent_name, None)
         if prompt is None or not prompt.strip():
             if prompt_path.exists():
                 try:
                     prompt_path.unlink()
-                    self.logger.info(f"Removed workspace prompt for {agent_name} ({prompt_path})")
+                    self.logger.info("Removed workspace prompt for %s (%s)", agent_name, prompt_path)
                 except Exception as exc:
-                    self.logger.exception(f"Failed to remove prompt for {agent_name}")
+                    self.logger.exception("Failed to remove prompt for %s", agent_name)
             return
 
         self._ensure_agent_prompt_dir(agent_name)
         try:
             prompt_path.write_text(prompt, encoding='utf-8')
-            self.logger.info(f"Saved workspace prompt for {agent_name} ({prompt_path})")
+            self.logger.info("Saved workspace prompt for %s (%s)", agent_name, prompt_path)
         except Exception:
-            self.logger.exception(f"Failed to save prompt for {agent_name}")
+            self.logger.exception("Failed to save prompt for %s", agent_name)
 
     # ---------------------------------------------------------------------
     # Role management helpers
@@ -1853,6 +2136,11 @@ class ConsiliumAgentTUI(App):
             self.role_manager.reload()
         return self.role_manager.list_roles()
 
+    @property
+    def role_names_normalized(self) -> frozenset[str]:
+        """Stripped, lowercased names of all roles (cached by the role manager)."""
+        return self.role_manager.normalized_names()
+
     def add_member_placeholder(self) -> asyncio.Task[AgentProfile] | None:
         backend = self.backend_registry.get_default_backend()
         if backend is None:
@@ -2027,15 +2315,15 @@ class ConsiliumAgentTUI(App):
         custom_prompt = self.agent_prompts.get(agent_name)
         if custom_prompt is None:
             if agent_name in self._agents_without_prompt:
-                self.logger.trace(f"ConsiliumAgentTUI:default prompt used for {agent_name}")
+                self.logger.trace("ConsiliumAgentTUI:default prompt used for %s", agent_name)
                 return self.system_prompt
             custom_prompt = self._load_agent_prompt_from_disk(agent_name)
             if custom_prompt:
                 self.set_agent_system_prompt(agent_name, custom_prompt, persist=False)
-                self.logger.trace(f"Workspace prompt applied for {agent_name}")
+                self.logger.trace("Workspace prompt applied for %s", agent_name)
             else:
                 self._agents_without_prompt.add(agent_name)
-                self.logger.trace(f"ConsiliumAgentTUI:prompt missing; default fallback for {agent_name}")
+                self.logger.trace("ConsiliumAgentTUI:prompt missing; default fallback for %s", agent_name)
                 return self.system_prompt
         return custom_prompt
 
@@ -2048,6 +2336,7 @@ class ConsiliumAgentTUI(App):
     ) -> None:
         """Update cached system prompt for agent (None -> remove override)."""
         text = None if prompt is None else str(prompt)
+        self._invalidate_prompt_prefixes()
 
         if text is None or not text.strip():
             had_prompt = agent_name in self.agent_prompts
@@ -2055,16 +2344,16 @@ class ConsiliumAgentTUI(App):
             already_missing = agent_name in self._agents_without_prompt
             self._agents_without_prompt.add(agent_name)
             if had_prompt:
-                self.logger.trace(f"Workspace prompt cleared for {agent_name}")
+                self.logger.trace("Workspace prompt cleared for %s", agent_name)
             elif not already_missing:
-                self.logger.debug(f"Agent prompt cleared (was empty): {agent_name}")
+                self.logger.debug("Agent prompt cleared (was empty): %s", agent_name)
             if persist:
                 self._save_agent_prompt_to_disk(agent_name, None)
             return
 
         current = self.agent_prompts.get(agent_name)
         if current == text:
-            self.logger.debug(f"Agent prompt unchanged for {agent_name}")
+            self.logger.debug("Agent prompt unchanged for %s", agent_name)
             self._agents_without_prompt.discard(agent_name)
             if persist:
                 self._save_agent_prompt_to_disk(agent_name, text)
@@ -2072,7 +2361,7 @@ class ConsiliumAgentTUI(App):
 
         self.agent_prompts[agent_name] = text
         self._agents_without_prompt.discard(agent_name)
-        self.logger.trace(f"Workspace prompt updated for {agent_name} ({len(text)} chars)")
+        self.logger.trace("Workspace prompt updated for %s (%d chars)", agent_name, len(text))
         if persist:
             self._save_agent_prompt_to_disk(agent_name, text)
 
@@ -2103,10 +2392,13 @@ class ConsiliumAgentTUI(App):
         else:
             participants_header.update_text(self._render_participants_header_text())
         yield participants_header
-        yield ChatLog(id="chat-log", markup=False, wrap=True, min_width=1, max_lines=2000)
-        yield ChatComposer()
+        self._chat_log = ChatLog(id="chat-log", markup=False, wrap=True, min_width=1, max_lines=2000)
+        yield self._chat_log
+        self._composer = ChatComposer()
+        yield self._composer
         yield AnimatedStatusBar(STATUS_READY, id="status-bar")
-        yield ConsiliumFooter(show_command_palette=False)
+        self._footer = ConsiliumFooter(show_command_palette=False)
+        yield self._footer
 
     def _ensure_exception_handler(self) -> None:
         """Install asyncio exception handler once."""
@@ -2166,13 +2458,13 @@ class ConsiliumAgentTUI(App):
         self.logger.trace("ConsiliumAgentTUI:on_mount start")
         try:
             self._refresh_participants_ui()
-            chat_log = self.query_one(ChatLog)
+            chat_log = self._chat_log or self.query_one(ChatLog)
 
             # Restore chat history
             persisted_history = self.session_manager.load_history()
             history_count = len(persisted_history)
             if persisted_history:
-                self.logger.info(f"Restoring {history_count} messages from history")
+                self.logger.info("Restoring %s messages from history", history_count)
                 for msg in persisted_history:
                     self._display_historical_message(msg)
 
@@ -2227,13 +2519,7 @@ class ConsiliumAgentTUI(App):
         reply_to = msg.get('reply_to', msg.get('replyto'))
 
         # Mirror journal storage for previews
-        history_entry = {
-            'msg_id': msg_id,
-            'author': author,
-            'text': content,
-            'reply_to': reply_to,
-        }
-        self.history.append(history_entry)
+        self.history.append(HistoryEntry(msg_id, author, content, reply_to))
         if len(self.history) > self.history_limit:
             self.history = self.history[-self.history_limit:]
 
@@ -2287,7 +2573,7 @@ class ConsiliumAgentTUI(App):
         self.logger.info("Agents connected and ready")
         self.add_status(STATUS_READY)
         for agent_name, agent_config in self.agents.items():
-            self.logger.debug(f"{agent_name} session: {agent_config['session_id']}")
+            self.logger.debug("%s session: %s", agent_name, agent_config['session_id'])
         self.logger.trace("ConsiliumAgentTUI:init_agents complete")
 
     @staticmethod
@@ -2298,9 +2584,8 @@ class ConsiliumAgentTUI(App):
         normalized = str(text).strip()
         if not normalized:
             return True
-        normalized = re.sub(r"\s+", "", normalized)
-        if not normalized:
-            return True
+        if normalized[0] not in SILENT_RESPONSE_FIRST_CHARS:
+            return False
         return bool(SILENT_RESPONSE_PATTERN.fullmatch(normalized))
 
     @staticmethod
@@ -2312,6 +2597,10 @@ class ConsiliumAgentTUI(App):
         Solution: Preserve double newlines inside markdown code blocks (```),
                  normalize them elsewhere to prevent UI truncation.
         """
+        if '\n\n' not in text:
+            # Nothing to normalize
+            return text
+
         if '```' not in text:
             # Fast path: no code blocks, safe to normalize
             return text.replace('\n\n', '\n')
@@ -2359,12 +2648,7 @@ class ConsiliumAgentTUI(App):
         text = entry.text
         reply_to = entry.metadata.get('replyto') if entry.metadata else None
 
-        self.history.append({
-            'msg_id': entry.id,
-            'author': author,
-            'text': text,
-            'reply_to': reply_to,
-        })
+        self.history.append(HistoryEntry(entry.id, author, text, reply_to))
         if len(self.history) > self.history_limit:
             self.history = self.history[-self.history_limit:]
 
@@ -2405,7 +2689,7 @@ class ConsiliumAgentTUI(App):
         """Add message to chat"""
         chat_log = self._get_chat_log()
         if chat_log is None:
-            self.logger.debug(f"Skipping UI message from {author}: {text}")
+            self.logger.debug("Skipping UI message from %s: %s", author, text)
             return
 
         # Clear status bar when real message appears in chat
@@ -2436,10 +2720,13 @@ class ConsiliumAgentTUI(App):
         if author == 'User':
             text = text.replace('\n', '  \n')
 
-        text = self._format_context_headers(text)
-        preview = self._build_reply_preview(metadata)
-        if preview:
-            text = f"{preview}\n\n{text}"
+        # Courier-style headers only appear in agent output
+        if author != 'User':
+            text = self._format_context_headers(text)
+        if metadata and ('replyto' in metadata or 'reply_to' in metadata):
+            preview = self._build_reply_preview(metadata)
+            if preview:
+                text = f"{preview}\n\n{text}"
         text = self._highlight_mentions(text)
 
         # Emoji prefix
@@ -2490,7 +2777,7 @@ class ConsiliumAgentTUI(App):
 
         chat_log = self._get_chat_log()
         if chat_log is None:
-            self.logger.debug(f"Tool call skipped in UI: {agent} -> {tool_name}")
+            self.logger.debug("Tool call skipped in UI: %s -> %s", agent, tool_name)
             return
 
         # Use display name (nickname if set)
@@ -2506,19 +2793,19 @@ class ConsiliumAgentTUI(App):
             )
 
         self._write_chat(msg)
-        self.logger.debug(f"[{agent}] Tool call: {tool_name} | {details}")
+        self.logger.debug("[%s] Tool call: %s | %s", agent, tool_name, details)
 
     def add_thinking(self, agent: str, thought: str):
         """Add thinking process to chat"""
         chat_log = self._get_chat_log()
         if chat_log is None:
-            self.logger.debug(f"Skipping thinking message for {agent}: {thought}")
+            self.logger.debug("Skipping thinking message for %s: %s", agent, thought)
             return
         # Use display name (nickname if set)
         display_name = self.get_agent_display_name(agent)
         # Simple dark gray italic text, no emoji, no color
         self._write_chat(Text(f"{display_name}: {thought}", style="italic #444444"))
-        self.logger.debug(f"[{agent}] Thinking: {thought}")
+        self.logger.debug("[%s] Thinking: %s", agent, thought)
 
     def _highlight_mentions(self, text: str) -> str:
         """Bold known @mentions (agents, user aliases, @all)."""
@@ -2549,16 +2836,16 @@ class ConsiliumAgentTUI(App):
         except (TypeError, ValueError):
             return None
 
-        referenced_entry: dict[str, Any] | None = None
+        referenced_entry: HistoryEntry | None = None
         for entry in reversed(self.history):
-            if entry.get('msg_id') == reply_id:
+            if entry.msg_id == reply_id:
                 referenced_entry = entry
                 break
 
         if not referenced_entry:
             return None
 
-        quoted_author = referenced_entry.get('author', 'Unknown')
+        quoted_author = referenced_entry.author or 'Unknown'
         if quoted_author == 'User':
             quoted_display = self.get_agent_display_name('User')
         elif quoted_author in self.agents:
@@ -2566,7 +2853,7 @@ class ConsiliumAgentTUI(App):
         else:
             quoted_display = quoted_author
 
-        snippet = str(referenced_entry.get('text') or '').strip()
+        snippet = str(referenced_entry.text or '').strip()
         if not snippet:
             return None
 
@@ -2615,43 +2902,33 @@ class ConsiliumAgentTUI(App):
         if not text.startswith('[#'):
             return text
 
-        lines = text.splitlines()
-        new_lines: list[str] = []
-        idx = 0
-
-        if idx < len(lines):
-            first = lines[idx]
-            if 'from:' in first or 'to:' in first:
-                first = re.sub(r'\[#(\d+)\]', lambda m: f"**[# {m.group(1)}]**", first)
-                first = self._bold_header_token(first, 'from:')
-                first = self._bold_header_token(first, 'to:')
-                first = first.replace('**to:**', '\n**to:**', 1)
-                new_lines.extend(first.splitlines())
-                idx += 1
-            else:
-                new_lines.append(f"**{first}**")
-                idx += 1
-
-        while idx < len(lines):
-            lower = lines[idx].lower()
-            if lower.startswith('from:'):
-                new_lines.append(self._bold_header_token(lines[idx], 'from:'))
-            elif lower.startswith('to:'):
-                new_lines.append(self._bold_header_token(lines[idx], 'to:'))
-            else:
-                break
-            idx += 1
+        first, newline, rest = text.partition('\n')
+        if 'from:' in first or 'to:' in first:
+            first = _CTX_ID_RE.sub(r"**[# \1]**", first)
+            first = self._bold_header_token(first, 'from:')
+            first = self._bold_header_token(first, 'to:')
+            first = first.replace('**to:**', '\n**to:**', 1)
+        else:
+            first = f"**{first}**"
 
-        # Append remaining lines untouched
-        if idx < len(lines):
-            new_lines.extend(lines[idx:])
+        if not newline:
+            return first
 
-        return '\n'.join(new_lines)
+        # Bold the from:/to: lines directly following the first line; the body stays untouched
+        header_block = _CTX_HEADER_BLOCK_RE.match(rest)
+        if header_block:
+            end = header_block.end()
+            rest = _CTX_HEADER_LINE_RE.sub(self._bold_lower, rest[:end]) + rest[end:]
+
+        return f"{first}\n{rest}"
 
     @staticmethod
-    def _bold_header_token(line: str, token: str) -> str:
-        pattern = re.compile(re.escape(token), re.IGNORECASE)
-        return pattern.sub(lambda m: f"**{m.group(0).lower()}**", line, count=1)
+    def _bold_lower(match: re.Match[str]) -> str:
+        return f"**{match.group(0).lower()}**"
+
+    @classmethod
+    def _bold_header_token(cls, line: str, token: str) -> str:
+        return _header_token_pattern(token).sub(cls._bold_lower, line, count=1)
 
     def add_status(self, text: str):
         """Add status message to status bar with auto-clear timer for 'stayed silent' messages"""
@@ -2662,39 +2939,47 @@ class ConsiliumAgentTUI(App):
             return
 
         status_bar.update_text(text)
-        self.logger.debug(f"Status: {text}")
+        self.logger.debug("Status: %s", text)
 
         # Schedule auto-clear for "stayed silent" messages
         self._schedule_status_clear(text)
 
     def _schedule_status_clear(self, text: str):
-        """Schedule auto-clear timer for 'stayed silent' status messages (10 seconds)"""
-        # Cancel existing timer if any
-        if self._status_clear_timer is not None:
-            self._status_clear_timer.stop()
-            self._status_clear_timer = None
-
-        # Only auto-clear "stayed silent" messages
+        """Arm auto-clear deadline for 'stayed silent' status messages (10 seconds)"""
+        # Any newer status cancels a pending clear
         if "stayed silent" not in text.lower():
+            self._status_clear_deadline = None
             return
 
-        def check_and_clear_silent():
-            """Check if status bar still shows 'stayed silent', then replace with 'Ready...'"""
-            status_bar = self._status_bar_widget
-            if status_bar is None:
-                return
+        self._status_clear_deadline = time.monotonic() + SILENT_STATUS_CLEAR_DELAY
+        if self._status_clear_timer is None:
+            self._status_clear_timer = self.set_interval(1.0, self._maybe_clear_silent_status)
+        else:
+            self._status_clear_timer.resume()
 
-            current_text = getattr(status_bar, "_text", "")
+    def _maybe_clear_silent_status(self) -> None:
+        """Replace 'stayed silent' with 'Ready...' once the deadline has passed."""
+        deadline = self._status_clear_deadline
+        if deadline is not None and time.monotonic() < deadline:
+            return
 
-            # Only clear if status still shows "stayed silent" pattern
-            if "stayed silent" in current_text.lower():
-                status_bar.update_text(STATUS_READY)
-                self._pending_status_text = STATUS_READY
-                self.logger.debug("Status auto-cleared (stayed silent → Ready...)")
-            self._status_clear_timer = None
+        self._status_clear_deadline = None
+        if self._status_clear_timer is not None:
+            self._status_clear_timer.pause()
+        if deadline is None:
+            return
 
-        # Set 10-second timer (non-blocking)
-        self._status_clear_timer = self.set_timer(10.0, check_and_clear_silent)
+        status_bar = self._status_bar_widget
+        if status_bar is None:
+            return
+
+        current_text = getattr(status_bar, "_text", "")
+
+        # Only clear if status still shows "stayed silent" pattern
+        if "stayed silent" in current_text.lower():
+            status_bar.update_text(STATUS_READY)
+            self._pending_status_text = STATUS_READY
+            self.logger.debug("Status auto-cleared (stayed silent → Ready...)")
 
     # ------------------------------------------------------------------
     # Status bar registration helpers
@@ -2732,7 +3017,7 @@ class ConsiliumAgentTUI(App):
         """Display an error message in the chat log."""
         chat_log = self._get_chat_log()
         if chat_log is None:
-            self.logger.error(f"Error (UI unavailable): {text}")
+            self.logger.error("Error (UI unavailable): %s", text)
             return
         normalized = self._normalize_text_for_display(text)
         msg = Text()
@@ -2741,9 +3026,9 @@ class ConsiliumAgentTUI(App):
         msg.append(normalized, style="red")
         self._write_chat(msg)
         if agent:
-            self.logger.error(f"[{agent}] {normalized}")
+            self.logger.error("[%s] %s", agent, normalized)
         else:
-            self.logger.error(f"Chat error displayed: {normalized}")
+            self.logger.error("Chat error displayed: %s", normalized)
 
     async def _call_agent_cli(self, agent: str, cmd: list, event_parser, timeout: int = 1800):
         """Run agent CLI command safely and return (text, actions)."""
@@ -2751,29 +3036,28 @@ class ConsiliumAgentTUI(App):
         lock = self._get_agent_lock(agent)
         async with lock:
             process = None
-            stderr_task = None
-            errors: list[tuple[str, bool]] = []
+            stderr_result = None
+            # Forced errors are always reported; soft ones only on non-zero exit
+            forced_errors: list[str] = []
+            soft_errors: list[str] = []
 
             def record_error(message: str, *, force: bool = False) -> None:
                 normalized = str(message).strip()
                 if normalized:
-                    errors.append((normalized, force))
+                    (forced_errors if force else soft_errors).append(normalized)
 
             def get_error_messages(return_code: int | None) -> list[str]:
-                if not errors:
-                    return []
-                messages: list[str] = []
-                for message, force in errors:
-                    if force or (return_code is not None and return_code != 0):
-                        messages.append(message)
-                return messages
+                if return_code in (None, 0) or not soft_errors:
+                    return forced_errors
+                return forced_errors + soft_errors
 
             try:
-                self.logger.debug(f"[{agent}] Command: {' '.join(cmd[:6])}...")
+                if self.logger.isEnabledFor(logging.DEBUG):
+                    self.logger.debug("[%s] Command: %s...", agent, ' '.join(cmd[:6]))
                 self.logger.trace("ConsiliumAgentTUI:_call_agent_cli start agent=%s", agent)
 
                 if self._shutting_down or self._interrupt_requested:
-                    self.logger.debug(f"[{agent}] Shutdown/interrupt in progress; skipping CLI call")
+                    self.logger.debug("[%s] Shutdown/interrupt in progress; skipping CLI call", agent)
                     return None, set(), []
 
                 process = await self._create_subprocess_exec(
@@ -2782,64 +3066,59 @@ class ConsiliumAgentTUI(App):
                     stderr=asyncio.subprocess.PIPE,
                     cwd=str(self.workspace_root),
                     limit=STREAM_READER_LIMIT,
+                    start_new_session=True,
                 )
 
                 # Save process reference in agent config for potential killing
                 if agent in self.agents:
                     self.agents[agent]['process'] = process
 
-                stderr_task = self._create_task(process.stderr.read())
+                stderr_result = self._queue_stderr(agent, process.stderr)
 
                 async def read_stdout():
                     final_text = ""
                     actions = set()
-                    non_json_buffer: list[str] = []
+                    # Raw bytes of consecutive non-JSON lines; decoded once on flush
+                    non_json_buffer = bytearray()
+                    # Resolved once per call so the per-event dump costs nothing when trace is off
+                    trace_events = self.logger.isEnabledFor(TRACE_LEVEL)
 
                     def flush_non_json_buffer() -> None:
                         if not non_json_buffer:
                             return
-                        combined = " ".join(segment.strip() for segment in non_json_buffer if segment.strip())
+                        combined = " ".join(non_json_buffer.decode("utf-8", "replace").split())
                         non_json_buffer.clear()
-                        if not combined:
-                            return
-                        lowered = combined.lower()
-                        keywords = ("error ", "error:", "failed", "exception", "resource exhausted", "non utf-8", "json decode")
-                        force = any(keyword in lowered for keyword in keywords) or "error code" in lowered or "status code" in lowered
-                        if force:
+                        if combined and _ERROR_KW_RE.search(combined):
                             record_error(combined, force=True)
 
-                    def append_non_json_line(raw_line: str) -> None:
-                        stripped_line = raw_line.strip()
-                        if stripped_line:
-                            non_json_buffer.append(stripped_line)
-
                     try:
                         while True:
                             # Check if agent was disabled during processing
                             if agent in self.agents and not self.agents[agent].get('enabled', True):
-                                self.logger.info(f"[{agent}] Agent was disabled during processing, stopping read loop")
+                                self.logger.info("[%s] Agent was disabled during processing, stopping read loop", agent)
                                 # Kill process if it's still running (defensive check)
                                 if process and process.returncode is None:
                                     try:
-                                        process.kill()
-                                        self.logger.debug(f"[{agent}] Killed process from read loop")
+                                        self._kill_process_group(process)
+                                        self._close_process_pipes(process)
+                                        self.logger.debug("[%s] Killed process from read loop", agent)
                                     except (ProcessLookupError, OSError) as e:
-                                        self.logger.debug(f"[{agent}] Process already dead in read loop: {e}")
+                                        self.logger.debug("[%s] Process already dead in read loop: %s", agent, e)
                                 break
 
                             try:
                                 line = await process.stdout.readline()
                             except ValueError as stream_error:
                                 error_text = str(stream_error)
-                                self.logger.error(f"[{agent}] Stream read error: {error_text}")
+                                self.logger.error("[%s] Stream read error: %s", agent, error_text)
                                 record_error(error_text, force=True)
                                 break
                             except (BrokenPipeError, ConnectionResetError) as pipe_error:
                                 # Process was killed, this is expected
-                                self.logger.debug(f"[{agent}] Pipe broken (process was killed): {pipe_error}")
+                                self.logger.debug("[%s] Pipe broken (process was killed): %s", agent, pipe_error)
                                 break
                             except Exception as read_error:
-                                self.logger.error(f"[{agent}] Unexpected read error: {read_error}")
+                                self.logger.error("[%s] Unexpected read error: %s", agent, read_error)
                                 break
                             if not line:
                                 break
@@ -2847,26 +3126,27 @@ class ConsiliumAgentTUI(App):
                             try:
                                 decoded_line = line.decode("utf-8")
                             except UnicodeDecodeError as decode_error:
-                                self.logger.error(f"[{agent}] Non UTF-8 output: {decode_error}")
+                                self.logger.error("[%s] Non UTF-8 output: %s", agent, decode_error)
                                 record_error(f"{agent}: non UTF-8 output ({decode_error})", force=True)
                                 continue
 
                             try:
-                                event = json.loads(decoded_line)
+                                event = json_loads(decoded_line)
                                 flush_non_json_buffer()
                             except json.JSONDecodeError as decode_error:
-                                self.logger.error(f"[{agent}] JSON decode error: {decode_error}")
-                                append_non_json_line(decoded_line)
+                                self.logger.error("[%s] JSON decode error: %s", agent, decode_error)
+                                non_json_buffer.extend(line)
                                 continue
 
-                            self.logger.trace(f"[{agent}] EVENT: {json.dumps(event, ensure_ascii=False)[:300]}")
+                            if trace_events:
+                                self.logger.trace("[%s] EVENT: %s", agent, json_dumps(event)[:300])
 
                             try:
                                 parsed = event_parser(event, final_text)
                                 if inspect.isawaitable(parsed):
                                     parsed = await parsed
                             except Exception as parser_error:
-                                self.logger.error(f"[{agent}] Event parser error: {parser_error}", exc_info=True)
+                                self.logger.error("[%s] Event parser error: %s", agent, parser_error, exc_info=True)
                                 continue
 
                             new_text = None
@@ -2907,29 +3187,27 @@ class ConsiliumAgentTUI(App):
                 final_text, actions = await asyncio.wait_for(read_stdout(), timeout=timeout)
 
                 try:
-                    await asyncio.wait_for(process.wait(), timeout=10)
+                    async with async_timeout(10):
+                        await process.wait()
                 except asyncio.TimeoutError:
-                    self.logger.warning(f"[{agent}] Process did not exit within cleanup timeout, killing")
-                    process.kill()
-                    await process.wait()
+                    self.logger.warning("[%s] Process did not exit within cleanup timeout, killing", agent)
+                    self._kill_process_group(process)
+                    await self._reap_killed_process(process)
 
                 stderr_output = ""
-                if stderr_task:
+                if stderr_result is not None:
                     try:
-                        stderr_data = await asyncio.wait_for(stderr_task, timeout=1)
+                        async with async_timeout(1):
+                            stderr_data = await stderr_result
                         stderr_output = stderr_data.decode('utf-8', errors='replace').strip()
                     except asyncio.TimeoutError:
-                        stderr_task.cancel()
-                        try:
-                            await stderr_task
-                        except asyncio.CancelledError:
-                            pass
+                        pass  # Drain is released in the cleanup below
 
                 if process.returncode and process.returncode != 0:
                     if stderr_output:
-                        self.logger.error(f"[{agent}] stderr: {stderr_output}")
-                    self.logger.error(f"[{agent}] Exit code: {process.returncode}")
-                    self.logger.debug(f"[{agent}] return code {process.returncode} (non-zero)")
+                        self.logger.error("[%s] stderr: %s", agent, stderr_output)
+                    self.logger.error("[%s] Exit code: %s", agent, process.returncode)
+                    self.logger.debug("[%s] return code %s (non-zero)", agent, process.returncode)
                     if final_text and str(final_text).strip():
                         record_error(str(final_text).strip(), force=True)
                     if stderr_output:
@@ -2937,52 +3215,32 @@ class ConsiliumAgentTUI(App):
                     return final_text, actions, get_error_messages(process.returncode)
 
                 if stderr_output:
-                    self.logger.debug(f"[{agent}] stderr: {stderr_output}")
+                    self.logger.debug("[%s] stderr: %s", agent, stderr_output)
 
                 actual_code = process.returncode if process else None
-                self.logger.trace(f"[{agent}] return code {actual_code} (normal path)")
+                self.logger.trace("[%s] return code %s (normal path)", agent, actual_code)
                 return final_text, actions, get_error_messages(actual_code)
 
             except asyncio.TimeoutError:
-                self.logger.error(f"[{agent}] Timeout after {timeout} seconds")
+                self.logger.error("[%s] Timeout after %s seconds", agent, timeout)
                 actual_code = process.returncode if process else None
-                self.logger.warning(f"[{agent}] timed out with return code {actual_code}")
+                self.logger.warning("[%s] timed out with return code %s", agent, actual_code)
                 record_error(f"{agent}: timeout exceeded ({timeout}s)", force=True)
                 return None, set(), get_error_messages(actual_code)
             except Exception as error:
-                self.logger.error(f"[{agent}] Error: {error}", exc_info=True)
+                self.logger.error("[%s] Error: %s", agent, error, exc_info=True)
                 actual_code = process.returncode if process else None
-                self.logger.warning(f"[{agent}] exception handling CLI (return code {actual_code})")
+                self.logger.warning("[%s] exception handling CLI (return code %s)", agent, actual_code)
                 record_error(f"{agent}: error {error}", force=True)
                 return None, set(), get_error_messages(actual_code)
             finally:
-                if stderr_task and not stderr_task.done():
-                    stderr_task.cancel()
-                    try:
-                        await stderr_task
-                    except asyncio.CancelledError:
-                        pass
+                # Abandon an unfinished stderr read, then reap the process
+                self._release_stderr_drain(agent, stderr_result)
+                await self._kill_and_wait(agent, process)
 
                 if process:
-                    # Kill process if still running
-                    if process.returncode is None:
-                        try:
-                            self.logger.warning(f"[{agent}] Killing leftover process")
-                            process.kill()
-                            # Wait with timeout to prevent hanging on unresponsive processes
-                            try:
-                                await asyncio.wait_for(process.wait(), timeout=2.0)
-                            except asyncio.TimeoutError:
-                                self.logger.warning(f"[{agent}] Process did not terminate in time, forcing")
-                        except (ProcessLookupError, OSError) as e:
-                            self.logger.debug(f"[{agent}] Process already terminated in cleanup: {e}")
-
-                    # Remove from running subprocesses list
-                    if process in self._running_subprocesses:
-                        try:
-                            self._running_subprocesses.remove(process)
-                        except ValueError:
-                            pass  # Already removed
+                    # Remove from running subprocesses set
+                    self._running_subprocesses.discard(process)
 
                     # Clear process reference from agent config
                     if agent in self.agents and self.agents[agent].get('process') == process:
@@ -2997,68 +3255,61 @@ class ConsiliumAgentTUI(App):
     #     """Format history for prompt"""
     #     return "\n".join([f"{author}: {text}" for author, text in self.history])
 
-    def _parse_mentions(self, text: str) -> list[str]:
-        """Extract @mentions from text and resolve to canonical agent names."""
-        import re
-
-        # Find all @mentions in text
-        mention_pattern = r'@(\w+(?:\.\w+)*)'
-        found_mentions = re.findall(mention_pattern, text)
+    def _get_mention_lookup(self) -> dict[str, str]:
+        """Return lowercase display/canonical name -> canonical name map, rebuilt when agents change."""
+        if self._mention_lookup is not None and self._mention_lookup_version == self._agents_version:
+            return self._mention_lookup
 
-        if not found_mentions:
-            return []
-
-        # Build reverse map: display_name -> canonical_name
         display_to_canonical: dict[str, str] = {}
         for canonical_name in self.agents.keys():
             display_name = self.get_agent_display_name(canonical_name)
             # Normalize for case-insensitive matching
             display_to_canonical[display_name.lower()] = canonical_name
-            display_to_canonical[canonical_name.lower()] = canonical_name
+        # Canonical names are kept lowercased alongside self.agents
+        display_to_canonical.update(self._agents_lc)
 
-        # Resolve mentions to canonical names
-        resolved: list[str] = []
-        seen: set[str] = set()
+        self._mention_lookup = display_to_canonical
+        self._mention_lookup_version = self._agents_version
+        return display_to_canonical
 
-        for mention in found_mentions:
-            normalized = mention.lower()
-            if normalized in display_to_canonical:
-                canonical = display_to_canonical[normalized]
-                if canonical not in seen:
-                    resolved.append(canonical)
-                    seen.add(canonical)
+    def _parse_all_mentions(self, text: str) -> tuple[str | None, list[str]]:
+        """
+        Extract @@mention (private) and @mentions from text in a single scan.
 
-        return resolved
+        Returns (private_to, mentions). A resolvable first @@mention wins and
+        yields no regular mentions; otherwise every mention is resolved to its
+        canonical agent name, deduplicated in order of appearance.
+        """
+        # Most messages carry no mentions; skip the regex scan entirely
+        if '@' not in text:
+            return None, []
 
-    def _parse_private_mention(self, text: str) -> str | None:
-        """Extract @@mention (private) from text and resolve to canonical agent name."""
-        import re
+        found = _COMBINED_MENTION_RE.findall(text)
 
-        # Find all @@mentions in text
-        private_pattern = r'@@(\w+(?:\.\w+)*)'
-        found_mentions = re.findall(private_pattern, text)
+        if not found:
+            return None, []
 
-        if not found_mentions:
-            return None
+        display_to_canonical = self._get_mention_lookup()
 
-        if len(found_mentions) > 1:
-            self.logger.warning("Multiple @@mentions found (%d), using first one only", len(found_mentions))
+        private_mentions = [name for prefix, name in found if prefix == '@@']
+        if private_mentions:
+            if len(private_mentions) > 1:
+                self.logger.warning("Multiple @@mentions found (%d), using first one only", len(private_mentions))
+            private_to = display_to_canonical.get(private_mentions[0].lower())
+            if private_to:
+                return private_to, []
 
-        # Build reverse map: display_name -> canonical_name
-        display_to_canonical: dict[str, str] = {}
-        for canonical_name in self.agents.keys():
-            display_name = self.get_agent_display_name(canonical_name)
-            # Normalize for case-insensitive matching
-            display_to_canonical[display_name.lower()] = canonical_name
-            display_to_canonical[canonical_name.lower()] = canonical_name
+        # Resolve mentions to canonical names
+        resolved: list[str] = []
+        seen: set[str] = set()
 
-        # Resolve first mention to canonical name
-        mention = found_mentions[0]
-        normalized = mention.lower()
-        if normalized in display_to_canonical:
-            return display_to_canonical[normalized]
+        for _prefix, mention in found:
+            canonical = display_to_canonical.get(mention.lower())
+            if canonical and canonical not in seen:
+                resolved.append(canonical)
+                seen.add(canonical)
 
-        return None
+        return None, resolved
 
     async def process_message(
         self,
@@ -3080,14 +3331,13 @@ class ConsiliumAgentTUI(App):
         metadata = {}
 
         if initial_author == 'User':
-            private_to = self._parse_private_mention(initial_text)
+            private_to, mentions = self._parse_all_mentions(initial_text)
             if private_to:
                 metadata['private_to'] = private_to
                 metadata['status'] = 'secret'
                 self.logger.debug("User sent private message to: %s", private_to)
             else:
-                # No @@ found, parse regular @mentions
-                mentions = self._parse_mentions(initial_text)
+                # No resolvable @@ found, use regular @mentions
                 if mentions:
                     metadata['mentions'] = mentions
                     self.logger.debug("User mentioned: %s", mentions)
@@ -3118,11 +3368,11 @@ class ConsiliumAgentTUI(App):
         # Reset composer state
         event.composer.reset()
 
-        self.logger.trace(f"[User] INPUT: {user_msg}")
+        self.logger.trace("[User] INPUT: %s", user_msg)
 
         # Commands
-        if user_msg in ['/exit', '/quit']:
-            self.logger.info(f"User closed chat ({user_msg})")
+        if user_msg in _QUIT_COMMANDS:
+            self.logger.info("User closed chat (%s)", user_msg)
             self._shutdown_trigger = f"user command {user_msg}"
             self._create_task(self._shutdown_and_exit())
             return
@@ -3161,10 +3411,11 @@ class ConsiliumAgentTUI(App):
         self.logger.info("App.exit called (result=%s, reason=%s)", result, self._shutdown_trigger or "unknown")
 
         # Detailed call stack for deep debugging (TRACE level only)
-        import traceback
-        stack_summary = traceback.extract_stack(limit=10)
-        stack = "".join(traceback.format_list(stack_summary[:-1]))
-        self.logger.trace("Exit call stack:\n%s", stack)
+        if self.logger.isEnabledFor(TRACE_LEVEL):
+            import traceback
+            stack_summary = traceback.extract_stack(limit=10)
+            stack = "".join(traceback.format_list(stack_summary[:-1]))
+            self.logger.trace("Exit call stack:\n%s", stack)
 
         return super().exit(result)
 
@@ -3180,7 +3431,7 @@ class ConsiliumAgentTUI(App):
 
     def _open_general_prompt_editor(self) -> None:
         """Open existing general prompt editor."""
-        config_path = Path.home() / ".consilium" / "prompts.toml"
+        config_path = PROMPTS_TOML_PATH
         self.logger.trace("ConsiliumAgentTUI:opening general prompt editor")
 
         # Ensure config exists
@@ -3191,7 +3442,7 @@ class ConsiliumAgentTUI(App):
         def on_editor_dismiss(result: bool) -> None:
             """Handle editor result"""
             if result:
-                chat_log = self.query_one(ChatLog)
+                chat_log = self._chat_log or self.query_one(ChatLog)
                 chat_log.write(Text(TEXT_PROMPT_SAVED, style="bold white"))
                 self.logger.info("Prompts edited and saved")
             else:
@@ -3206,16 +3457,13 @@ class ConsiliumAgentTUI(App):
             self.logger.trace("ConsiliumAgentTUI:opening agent prompt editor %s", agent_name)
             self.push_screen(AgentPromptEditorScreen(agent_name))
         except Exception as exc:
-            self.logger.error(f"Error opening agent prompt editor for {agent_name}: {exc}", exc_info=True)
+            self.logger.error("Error opening agent prompt editor for %s: %s", agent_name, exc, exc_info=True)
             self.add_error(ERROR_EDITOR_OPEN.format(agent_name=agent_name, exc=exc), None)
 
     def action_edit_prompts(self) -> None:
         """Open prompt selection menu first."""
         try:
-            agent_entries = [
-                (name, self.agent_prompt_exists(name))
-                for name in self.agents.keys()
-            ]
+            agent_entries = self.agent_prompt_entries()
 
             def on_selection(selection: str | None) -> None:
                 try:
@@ -3234,12 +3482,12 @@ class ConsiliumAgentTUI(App):
                         return
                     self.add_status(STATUS_PROMPT_SELECTION_FAILED)
                 except Exception as exc:
-                    self.logger.error(f"Error in prompt selection handler: {exc}", exc_info=True)
+                    self.logger.error("Error in prompt selection handler: %s", exc, exc_info=True)
                     self.add_error(ERROR_PROMPT_SELECT.format(exc=exc), None)
 
             self.push_screen(PromptSelectionScreen(agent_entries), on_selection)
         except Exception as exc:
-            self.logger.error(f"Error opening prompt selection menu: {exc}", exc_info=True)
+            self.logger.error("Error opening prompt selection menu: %s", exc, exc_info=True)
             self.add_error(ERROR_PROMPT_MENU.format(exc=exc), None)
 
     def action_edit_members(self) -> None:
@@ -3278,7 +3526,7 @@ class ConsiliumAgentTUI(App):
         # If disabling mode while waiting, unblock immediately
         if not self.step_by_step_mode and self.waiting_for_step:
             self.waiting_for_step = False
-            self.step_event.set()
+            self._advance_step()
             self.add_message(
                 "System",
                 MSG_STEP_MODE_AUTO_CONTINUE,
@@ -3297,19 +3545,20 @@ class ConsiliumAgentTUI(App):
                 )
             else:
                 self.add_message("System", MSG_STEP_MODE_OFF, style_override="bright_white")
-        self.logger.info(f"Step-by-step mode: {'ON' if self.step_by_step_mode else 'OFF'}")
+        self.logger.info("Step-by-step mode: %s", 'ON' if self.step_by_step_mode else 'OFF')
         self._update_step_footer_color()
         self._sync_step_binding_label()
 
     def _update_step_footer_color(self) -> None:
         """Update footer background color based on step mode state"""
+        bg = _STEP_FOOTER_BG_ON if self.step_by_step_mode else _STEP_FOOTER_BG_OFF
+        if bg == self._last_footer_bg:
+            return
         try:
-            footer = self.query_one(Footer)
-            if self.step_by_step_mode:
-                footer.styles.background = "green"
-            else:
-                footer.styles.background = "rgb(38,38,38)"  # Default dark gray
-            self.logger.debug(f"Footer color updated: {'green' if self.step_by_step_mode else 'gray'}")
+            footer = self._footer or self.query_one(Footer)
+            footer.styles.background = bg
+            self._last_footer_bg = bg
+            self.logger.debug("Footer color updated: %s", 'green' if self.step_by_step_mode else 'gray')
         except NoMatches:
             self.logger.debug("Footer not found for color update")
 
@@ -3320,21 +3569,21 @@ class ConsiliumAgentTUI(App):
         if self._shutting_down or self._interrupt_requested:
             return False
         if self.waiting_for_step:
-            self.logger.debug("Step wait already in progress; reusing existing event")
-            await self.step_event.wait()
+            self.logger.debug("Step wait already in progress; joining it")
+            await self._wait_step_advance(self._step_gen)
             return not (self._shutting_down or self._interrupt_requested)
 
         self.waiting_for_step = True
-        self.step_event.clear()
+        generation = self._step_gen
         self.add_message(
             "System",
             f"⏸  {agent_name} is waiting for approval (Ctrl+N)",
             style_override="bright_white",
         )
-        self.logger.debug(f"Step mode: waiting before dispatching to {agent_name}")
+        self.logger.debug("Step mode: waiting before dispatching to %s", agent_name)
 
         try:
-            await self.step_event.wait()
+            await self._wait_step_advance(generation)
         finally:
             self.waiting_for_step = False
 
@@ -3342,12 +3591,12 @@ class ConsiliumAgentTUI(App):
             self.logger.debug("Step wait ended due to shutdown/interrupt")
             return False
 
-        self.logger.debug(f"Step mode: continuing, {agent_name} may proceed")
+        self.logger.debug("Step mode: continuing, %s may proceed", agent_name)
         return True
 
     def action_next_step(self) -> None:
         """Continue to next agent in step-by-step mode"""
-        self.logger.info(f"action_next_step called: mode={self.step_by_step_mode}, waiting={self.waiting_for_step}")
+        self.logger.info("action_next_step called: mode=%s, waiting=%s", self.step_by_step_mode, self.waiting_for_step)
 
         if not self.step_by_step_mode:
             self.add_message("System", MSG_STEP_MODE_DISABLED, style_override="bold red")
@@ -3358,15 +3607,32 @@ class ConsiliumAgentTUI(App):
             self.add_message("System", MSG_NO_PENDING_STEPS, style_override="bright_white")
             return
 
-        # Signal the event - this will unblock process_message
+        # Bump the generation - this will unblock process_message
         self.waiting_for_step = False
-        self.step_event.set()
+        self._advance_step()
         self.logger.debug("User advanced to next step")
 
+    async def _wait_step_advance(self, generation: int) -> None:
+        """Block until the step generation moves past ``generation`` or the run stops."""
+        async with self._step_cond:
+            await self._step_cond.wait_for(
+                lambda: self._step_gen != generation or self._shutting_down or self._interrupt_requested
+            )
+
+    def _advance_step(self) -> None:
+        """Bump the step generation and wake every pending step wait."""
+        self._step_gen += 1
+        self.call_later(self._notify_step_waiters)
+
+    async def _notify_step_waiters(self) -> None:
+        """Wake step waiters so they re-check their predicate."""
+        async with self._step_cond:
+            self._step_cond.notify_all()
+
     def action_scroll_home(self) -> None:
         """Scroll chat to top (oldest loaded message)"""
         try:
-            chat_log = self.query_one("#chat-log", ChatLog)
+            chat_log = self._chat_log or self.query_one("#chat-log", ChatLog)
             chat_log.scroll_home()
             self.logger.debug("Scrolled to top of chat history")
         except NoMatches:
@@ -3375,7 +3641,7 @@ class ConsiliumAgentTUI(App):
     def action_scroll_end(self) -> None:
         """Scroll chat to bottom (newest message)"""
         try:
-            chat_log = self.query_one("#chat-log", ChatLog)
+            chat_log = self._chat_log or self.query_one("#chat-log", ChatLog)
             chat_log.scroll_end()
             self.logger.debug("Scrolled to bottom of chat history")
         except NoMatches:
@@ -3384,29 +3650,37 @@ class ConsiliumAgentTUI(App):
     def action_page_up(self) -> None:
         """Scroll chat up by one page (terminal height)"""
         try:
-            chat_log = self.query_one("#chat-log", ChatLog)
+            chat_log = self._chat_log or self.query_one("#chat-log", ChatLog)
             # Get terminal height for page size
             page_size = max(25, chat_log.size.height)
             chat_log.scroll_relative(y=-page_size, animate=False)
-            self.logger.debug(f"Scrolled up by {page_size} lines")
+            self.logger.debug("Scrolled up by %s lines", page_size)
         except NoMatches:
             self.logger.debug("Chat log not available for page up")
 
     def action_page_down(self) -> None:
         """Scroll chat down by one page (terminal height)"""
         try:
-            chat_log = self.query_one("#chat-log", ChatLog)
+            chat_log = self._chat_log or self.query_one("#chat-log", ChatLog)
             # Get terminal height for page size
             page_size = max(25, chat_log.size.height)
             chat_log.scroll_relative(y=page_size, animate=False)
-            self.logger.debug(f"Scrolled down by {page_size} lines")
+            self.logger.debug("Scrolled down by %s lines", page_size)
         except NoMatches:
             self.logger.debug("Chat log not available for page down")
 
     def _sync_step_binding_label(self) -> None:
-        """Refresh footer so the step-mode label stays in sync."""
+        """Schedule a footer refresh so the step-mode label stays in sync."""
+        if self._footer_refresh_pending:
+            return
+        self._footer_refresh_pending = True
+        self.call_later(self._flush_footer_refresh)
+
+    def _flush_footer_refresh(self) -> None:
+        """Recompose the footer once for all label changes since the last flush."""
+        self._footer_refresh_pending = False
         try:
-            footer = self.query_one(ConsiliumFooter)
+            footer = self._footer or self.query_one(ConsiliumFooter)
         except NoMatches:
             return
 
@@ -3417,7 +3691,7 @@ class ConsiliumAgentTUI(App):
         if self._shutting_down:
             return
         try:
-            composer = self.query_one(ChatComposer)
+            composer = self._composer or self.query_one(ChatComposer)
             self.set_focus(composer)
         except NoMatches:
             self.logger.debug("Chat composer not found for focus")
@@ -30,6 +30,8 @@ class AgentBackendRegistry:
 
     def __init__(self, backend_classes: Sequence[Type[AgentBackend]] | None = None) -> None:
         self._backends: dict[str, AgentBackend] = {}
+        self._backends_tuple: tuple[AgentBackend, ...] = ()
+        self._backend_ids_sorted: tuple[str, ...] = ()
         self._default_backend_id: str | None = None
         self._initialize_defaults(backend_classes)
 
@@ -39,27 +41,30 @@ class AgentBackendRegistry:
         for backend in instantiated:
             self.register(backend)
         if instantiated:
-            self._default_backend_id = instantiated[0].class_id.lower()
+            self._default_backend_id = instantiated[0]._class_id_lc
 
     def register(self, backend: AgentBackend) -> None:
-        class_id = backend.class_id.lower()
-        self._backends[class_id] = backend
+        self._backends[backend._class_id_lc] = backend
+        self._backends_tuple = tuple(self._backends.values())
+        self._backend_ids_sorted = tuple(sorted(self._backends))
 
     def get_backend(self, class_id: str | None) -> Optional[AgentBackend]:
         if not class_id:
             return self.get_default_backend()
-        return self._backends.get(class_id.lower()) or self.get_default_backend()
+        # IDs are usually stored already lowercased; only normalize on a miss
+        backend = self._backends.get(class_id) or self._backends.get(class_id.lower())
+        return backend or self.get_default_backend()
 
     def get_default_backend(self) -> Optional[AgentBackend]:
         if self._default_backend_id is None:
             return None
         return self._backends.get(self._default_backend_id)
 
-    def list_backends(self) -> List[AgentBackend]:
-        return list(self._backends.values())
+    def list_backends(self) -> tuple[AgentBackend, ...]:
+        return self._backends_tuple
 
-    def list_backend_ids(self) -> List[str]:
-        return sorted(self._backends.keys())
+    def list_backend_ids(self) -> tuple[str, ...]:
+        return self._backend_ids_sorted
 
 
 __all__ = [
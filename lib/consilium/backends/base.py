@@ -5,10 +5,21 @@ Consilium Agent - Backend base classes.
 from __future__ import annotations
 
 import logging
+from functools import lru_cache, partial
 from typing import TYPE_CHECKING, Any
 
+from ..constants import IDENTITY_TEMPLATE, REPLY_CHAT_PROTOCOL_PROMPT
+from ..utils import TRACE_LEVEL
+
 if TYPE_CHECKING:
     from ..app import ConsiliumAgentTUI
+    from ..courier import AgentMessage
+
+
+@lru_cache(maxsize=64)
+def _identity_protocol_head(display_name: str) -> str:
+    """Identity line plus chat protocol; only the display name varies."""
+    return f"{IDENTITY_TEMPLATE.format(display_name=display_name)}\n{REPLY_CHAT_PROTOCOL_PROMPT}\n"
 
 
 class AgentBackend:
@@ -17,19 +28,154 @@ class AgentBackend:
     class_id: str = ""
     display_name: str = ""
     description: str = ""
+    # Executable used when neither the agent path nor the agent config names one
+    default_executable: str = ""
 
     def __init__(self) -> None:
         identifier = self.class_id or self.__class__.__name__
+        self._class_id_lc = self.class_id.lower()
         self.logger = logging.getLogger(f"ConsiliumBackend.{identifier}")
 
     async def run(
         self,
         app: ConsiliumAgentTUI,
         agent_name: str,
-        message: str,
+        message: AgentMessage,
         *,
         is_init: bool = False,
         skip_log: bool = False,
     ) -> Any:
+        """Send one message through the CLI; return {'text': ...}, an error dict or None."""
+        logger = app.logger
+
+        if app._shutting_down:
+            logger.debug("[%s] Shutdown in progress; skipping request", agent_name)
+            return None
+
+        agent_entry = app.agents.get(agent_name) or {}
+        cmd = self._prepare_command(app, agent_name, agent_entry, message, is_init=is_init, skip_log=skip_log)
+        if cmd is None:
+            return None
+
+        response, _actions, errors = await app._call_agent_cli(
+            agent_name, cmd, partial(self._parse_event, app, agent_name)
+        )
+
+        if errors:
+            return {'text': "\n".join(dict.fromkeys(errors)), 'error': True}
+
+        return self._finish_turn(app, agent_name, agent_entry, response)
+
+    def _build_command(self, command: str, prompt: str, session_id: str | None) -> list[str]:
+        """Return the CLI argv for one call."""
+        raise NotImplementedError
+
+    def _parse_event(self, app: ConsiliumAgentTUI, agent_name: str, event: dict, current_text: str):
+        """Interpret one streamed JSON event (see ConsiliumAgentTUI._call_agent_cli)."""
         raise NotImplementedError
 
+    def _prepare_command(
+        self,
+        app: ConsiliumAgentTUI,
+        agent_name: str,
+        agent_entry: dict[str, Any],
+        message: AgentMessage,
+        *,
+        is_init: bool,
+        skip_log: bool,
+    ) -> list[str] | None:
+        """Assemble the prompt for this turn and build argv; None if no executable is configured.
+
+        ``message`` may be a lazily formatted courier context; it is rendered here,
+        after the shutdown gate, so aborted turns never pay for formatting.
+        """
+        logger = app.logger
+        message = str(message)
+
+        # Periodic system prompt inclusion with cyclic counter
+        period = app.system_prompt_period
+        if self._should_include_prompts(agent_entry, period, is_init, caching=app.prompt_caching_enabled):
+            prompt = self._build_prompt(app, agent_name, message, is_init=is_init)
+            logger.trace("[%s] Including system prompts (counter reset, period=%s)", agent_name, period)
+        else:
+            prompt = message
+            logger.trace(
+                "[%s] Skipping system prompts (counter=%s/%s)",
+                agent_name, agent_entry.get('prompt_counter', 0), period,
+            )
+
+        if not skip_log and logger.isEnabledFor(TRACE_LEVEL):
+            logger.trace("=" * 50)
+            logger.trace("[%s] MESSAGE FORWARDING PROMPT:", agent_name)
+            logger.trace("Message: %s", message)
+            logger.trace("=" * 50)
+
+        command = app.get_agent_path(agent_name) or agent_entry.get('executable') or self.default_executable
+        if not command:
+            logger.error("[%s] CLI command path is not configured", agent_name)
+            app.add_error(f"{agent_name}: CLI command path is not configured", agent=agent_name)
+            return None
+
+        return self._build_command(command, prompt, agent_entry.get('session_id'))
+
+    @staticmethod
+    def _finish_turn(
+        app: ConsiliumAgentTUI, agent_name: str, agent_entry: dict[str, Any], response: Any
+    ) -> dict[str, Any] | None:
+        """Map a silent reply to None; otherwise count the message and queue a session save."""
+        if app._is_silent_response_text(response):
+            app.logger.debug("[%s] Stayed silent", agent_name)
+            return None
+
+        if agent_entry.get('session_id'):
+            agent_entry['message_count'] += 1
+            agent_id = agent_entry.get('agent_id') or agent_name
+            app.queue_agent_session_save(
+                agent_id,
+                agent_entry['session_id'],
+                agent_entry['message_count'],
+            )
+
+        return {'text': response}
+
+    @staticmethod
+    def _should_include_prompts(
+        agent_entry: dict[str, Any], period: int, is_init: bool, *, caching: bool = False
+    ) -> bool:
+        """Advance the agent's prompt counter and report whether this turn carries system prompts.
+
+        Init messages, and every message while provider prompt caching is on, include
+        prompts and leave the counter alone. Otherwise period 0 means init only,
+        1 means every message, N means every Nth message.
+        """
+        if is_init or caching:
+            return True
+        if period in (0, 1):
+            return period == 1
+        counter = agent_entry.get('prompt_counter', 0) + 1
+        if counter >= period:
+            counter = 0  # Reset after sending
+        agent_entry['prompt_counter'] = counter
+        return counter == 0
+
+    @staticmethod
+    def _build_prompt(app: ConsiliumAgentTUI, agent_name: str, message: str, *, is_init: bool = False) -> str:
+        """Prefix message with identity, chat protocol, participants and system prompt.
+
+        The prefix for regular turns is cached on the agent entry and reused until
+        app._prompt_prefix_version changes; init prefixes are rare and built fresh.
+        Keep the prefix byte-stable and the message strictly last so provider-side
+        automatic prompt caching can match it across turns.
+        """
+        entry = None if is_init else app.agents.get(agent_name)
+        if entry is not None and entry.get('_prompt_prefix_sig') == app._prompt_prefix_version:
+            prefix = entry['_prompt_prefix']
+        else:
+            head = _identity_protocol_head(app.get_agent_display_name(agent_name))
+            participants_line = app._get_active_participants()
+            system_prompt = app._get_agent_system_prompt(agent_name, is_init=is_init)
+            prefix = f"{head}{participants_line}\n{system_prompt}"
+            if entry is not None:
+                entry['_prompt_prefix'] = prefix
+                entry['_prompt_prefix_sig'] = app._prompt_prefix_version
+        return f"{prefix}\n\n{message}"
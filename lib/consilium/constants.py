@@ -9,15 +9,23 @@ Licensed under Artel Team Non-Commercial License
 """
 
 import re
+from pathlib import Path
 
 # ============================================================================
 # CONFIGURATION CONSTANTS
 # ============================================================================
 
+CONSILIUM_DIR = Path.home() / ".consilium"  # Per-user config root
+PROMPTS_TOML_PATH = CONSILIUM_DIR / "prompts.toml"
 STREAM_READER_LIMIT = 20 * 1024 * 1024  # 20 MiB to accommodate large JSON chunks
 SHUTDOWN_GRACE_PERIOD = 0.1  # seconds to wait between terminate() and kill()
+PROCESS_REAP_TIMEOUT = 2.0  # seconds to wait for a killed agent CLI to be reaped
+SILENT_STATUS_CLEAR_DELAY = 10.0  # seconds before a "stayed silent" status reverts to Ready
 HISTORY_TAIL_LINES = 2000  # Match ChatLog max_lines limit
-SILENT_RESPONSE_PATTERN = re.compile(r"^[\.\u2024\u2025\u2026\u2027\u22ef\u205d]+$")
+# Dots/ellipses with optional whitespace between them; match against stripped text
+SILENT_RESPONSE_PATTERN = re.compile(r"^[\s\.\u2024\u2025\u2026\u2027\u22ef\u205d]+$")
+# Non-space characters the pattern accepts; a stripped reply starting elsewhere is not silent
+SILENT_RESPONSE_FIRST_CHARS = frozenset(".\u2024\u2025\u2026\u2027\u22ef\u205d")
 
 # System prompt refresh period (experimental)
 # How often to include IDENTITY + PROTOCOL + PARTICIPANTS + ROLE in messages
@@ -25,6 +33,12 @@ SILENT_RESPONSE_PATTERN = re.compile(r"^[\.\u2024\u2025\u2026\u2027\u22ef\u205d]
 # Fibonacci sequence for testing: 2, 3, 5, 8, 13, 21, 34, 55, 89
 SYSTEM_PROMPT_PERIOD = 13  # TODO: make configurable via UI
 
+# With provider-side prompt caching the inverse tradeoff applies: an identical
+# prefix on every turn is a cache hit, while re-sending it only every Nth turn
+# is a miss each time it reappears. When enabled, SYSTEM_PROMPT_PERIOD is ignored
+# and system prompts are included on every message.
+PROMPT_CACHING_ENABLED = False
+
 # ============================================================================
 # HARDCODED TEXT CONSTANTS
 # ============================================================================
@@ -142,5 +156,5 @@ Block 1 — JSON header with metadata:
 Block 2 — after a single blank line, write your actual message in Markdown. Do not wrap the message in JSON or add extra keys.
 """
 
-# Template for message headers shown to agents
-CHAT_HEADER_TEMPLATE = 'HEADER:{{"#msg_id#": {msd_id},}}'
+# Template for message headers shown to agents; %-formatted with the message id
+CHAT_HEADER_TEMPLATE = 'HEADER:{"#msg_id#": %d,}'
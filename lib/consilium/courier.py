@@ -11,8 +11,12 @@ Licensed under Artel Team Non-Commercial License
 import json
 import re
 import logging
+import string
+from bisect import bisect_right
+from functools import lru_cache
+from operator import attrgetter
 from dataclasses import dataclass
-from collections import deque
+from collections import OrderedDict
 from typing import Any, Callable, Awaitable
 from datetime import datetime
 
@@ -42,6 +46,24 @@ class JournalEntry:
     metadata: dict[str, Any] | None = None
 
 
+_ENTRY_ID = attrgetter('id')
+_MENTION_RE = re.compile(r'@([^\s@]+)')
+_JSON_DECODER = json.JSONDecoder()
+# A JSON string literal (kept verbatim) or a comma before a closing brace/bracket
+_TRAILING_COMMA_RE = re.compile(r'("(?:[^"\\]|\\.)*")|,(\s*[}\]])', re.DOTALL)
+_NON_ALNUM_RE = re.compile(r'[^0-9a-z]+')
+# Same filter as _NON_ALNUM_RE for ASCII-only input, applied by str.translate
+_ALIAS_KEEP = string.ascii_lowercase + string.digits
+_ASCII_NON_ALNUM_DROP = str.maketrans('', '', ''.join(ch for ch in map(chr, range(128)) if ch not in _ALIAS_KEEP))
+_WS_RE = re.compile(r'\s*')
+# Opening code fence with an empty or JSON language tag, through its newline
+_JSON_FENCE_RE = re.compile(r'```[^\S\n]*(?:json5?|application/json)?[^\S\n]*\n', re.IGNORECASE)
+
+
+def _keep_string_or_closer(match: re.Match) -> str:
+    return match.group(1) or match.group(2)
+
+
 @dataclass(slots=True)
 class CourierHooks:
     add_status: Callable[[str], None]
@@ -52,7 +74,29 @@ class CourierHooks:
     is_step_mode_enabled: Callable[[], bool]
     get_display_name: Callable[[str], str]
     is_silent_response_text: Callable[[str], bool]
-    run_backend: Callable[[str, str, bool, bool], Awaitable[Any]]
+    run_backend: Callable[[str, "AgentMessage", bool, bool], Awaitable[Any]]
+    # Changes whenever agent names, nicknames or membership change
+    get_agents_version: Callable[[], int]
+
+
+class _LazyContext:
+    """Agent context handed to run_backend; formatted on first str() and reused."""
+
+    __slots__ = ('_courier', '_entries', '_text')
+
+    def __init__(self, courier: "ConsiliumCourier", entries: list[JournalEntry]) -> None:
+        self._courier = courier
+        self._entries = entries
+        self._text: str | None = None
+
+    def __str__(self) -> str:
+        if self._text is None:
+            self._text = self._courier._format_context(self._entries)
+        return self._text
+
+
+# What run_backend receives: plain text, or courier context that renders on str()
+AgentMessage = str | _LazyContext
 
 
 class ConsiliumCourier:
@@ -70,11 +114,25 @@ class ConsiliumCourier:
         self._hooks = hooks
         self._logger = logger
         self._journal: list[JournalEntry] = []
+        self._entries_by_id: dict[int, JournalEntry] = {}
         self._next_journal_id: int = max(0, last_message_id) + 1
         self._last_seen: dict[str, int] = {}
-        self._pending_agents: deque[str] = deque()
-        self._pending_membership: set[str] = set()
+        # Insertion-ordered pending set: O(1) enqueue, prioritize, pop and purge
+        self._pending: OrderedDict[str, None] = OrderedDict()
+        # Agents awaiting a backend reply; new work for them is batched until it returns
+        self._in_flight: set[str] = set()
+        self._needs_requeue: set[str] = set()
+        # Subset of _needs_requeue that was prioritized (mention/private) while in flight
+        self._priority_requeue: set[str] = set()
         self._drain_in_progress = False
+        # Resolved once; call sites check it before building the state note
+        self._debug_enabled = logger.isEnabledFor(logging.DEBUG)
+        # Participant list and alias map caches, keyed by _membership_key()
+        self._membership_version = 0
+        self._participants_cache: tuple[str, ...] | None = None
+        self._participants_key: tuple[int, int] | None = None
+        self._alias_map_cache: dict[str, str] | None = None
+        self._alias_map_key: tuple[int, int] | None = None
         if last_message_id:
             self._logger.debug("Courier initialized with last_message_id=%d", last_message_id)
 
@@ -103,7 +161,8 @@ class ConsiliumCourier:
             # Secret reply from agent - deliver directly to User, bypass pending
             self._last_seen['User'] = entry.id
             self._logger.debug("Secret reply from %s delivered directly to User", message.author)
-            self._debug_state(f"enqueue author={message.author} id={entry.id} (secret reply)")
+            if self._debug_enabled:
+                self._debug_state(f"enqueue author={message.author} id={entry.id} (secret reply)")
             return entry
 
         # Extract mentions and private_to from metadata (only set for User messages)
@@ -116,7 +175,8 @@ class ConsiliumCourier:
             mentions=mentions,
             private_to=private_to
         )
-        self._debug_state(f"enqueue author={message.author} id={entry.id}")
+        if self._debug_enabled:
+            self._debug_state(f"enqueue author={message.author} id={entry.id}")
         return entry
 
     async def drain(self) -> None:
@@ -124,7 +184,8 @@ class ConsiliumCourier:
         if self._drain_in_progress:
             return
         self._drain_in_progress = True
-        self._debug_state("drain start")
+        if self._debug_enabled:
+            self._debug_state("drain start")
         try:
             while True:
                 if self._hooks.is_shutting_down() or self._hooks.is_interrupt_requested():
@@ -138,7 +199,8 @@ class ConsiliumCourier:
                 if participant == 'User':
                     self._logger.debug("Courier deliver -> User (UI refresh)")
                     self._deliver_to_user()
-                    self._debug_state("post user delivery")
+                    if self._debug_enabled:
+                        self._debug_state("post user delivery")
                     continue
 
                 agent_config = self._agents.get(participant)
@@ -164,10 +226,12 @@ class ConsiliumCourier:
                     init_flag,
                 )
                 await self._dispatch_agent(participant, agent_config, context, init_flag)
-                self._debug_state(f"post delivery {participant}")
+                if self._debug_enabled:
+                    self._debug_state(f"post delivery {participant}")
         finally:
             self._drain_in_progress = False
-            self._debug_state("drain end")
+            if self._debug_enabled:
+                self._debug_state("drain end")
 
     # ------------------------------------------------------------------ #
     # Journal helpers
@@ -189,9 +253,12 @@ class ConsiliumCourier:
         )
         entry.metadata.setdefault('msg_id', entry.id)
         self._journal.append(entry)
+        self._entries_by_id[entry.id] = entry
         self._next_journal_id += 1
 
-        self._last_seen[author] = entry.id
+        # An agent replying while newer entries wait for it keeps its cursor so they are still delivered
+        if author not in self._needs_requeue:
+            self._last_seen[author] = entry.id
         self._ensure_participant_registered(author)
         return entry
 
@@ -199,15 +266,24 @@ class ConsiliumCourier:
         if participant not in self._last_seen:
             self._last_seen[participant] = 0
 
-    def _iter_participants(self) -> list[str]:
-        participants = ['User']
-        participants.extend(
+    def _membership_key(self) -> tuple[int, int]:
+        """(agents version from the app, local enable/disable counter)."""
+        return self._hooks.get_agents_version(), self._membership_version
+
+    def _iter_participants(self) -> tuple[str, ...]:
+        cache_key = self._membership_key()
+        if self._participants_cache is not None and self._participants_key == cache_key:
+            return self._participants_cache
+
+        participants = ('User', *(
             name
             for name, config in self._agents.items()
             if config.get('enabled', True)
-        )
+        ))
         for participant in participants:
             self._ensure_participant_registered(participant)
+        self._participants_cache = participants
+        self._participants_key = cache_key
         return participants
 
     def _schedule_pending_for(
@@ -222,9 +298,12 @@ class ConsiliumCourier:
             self._enqueue_pending_agent(private_to)
             if include_user:
                 self._enqueue_pending_agent('User')
-            self._prioritize_agent(private_to)
+            # Usually the queue was idle and the recipient is already first
+            if next(iter(self._pending), None) != private_to:
+                self._prioritize_agent(private_to)
             self._logger.debug("Private delivery to: %s", private_to)
-            self._debug_state(f"schedule_after author={author} (private)")
+            if self._debug_enabled:
+                self._debug_state(f"schedule_after author={author} (private)")
             return  # Early exit!
 
         # Regular delivery: all participants
@@ -241,17 +320,17 @@ class ConsiliumCourier:
                 self._prioritize_agent(mentioned_agent)
             self._logger.debug("Prioritized mentions: %s", mentions)
 
-        self._debug_state(f"schedule_after author={author}")
+        if self._debug_enabled:
+            self._debug_state(f"schedule_after author={author}")
 
     def _build_context_for(self, participant: str) -> list[JournalEntry]:
         last_seen_id = self._last_seen.get(participant, 0)
         context = []
         last_seen_candidate = last_seen_id
 
-        for entry in self._journal:
-            if entry.id <= last_seen_id:
-                continue
-
+        # Journal ids strictly increase, so unseen entries form a tail
+        start = bisect_right(self._journal, last_seen_id, key=_ENTRY_ID)
+        for entry in self._journal[start:]:
             # Track last ID even if we skip the message
             last_seen_candidate = entry.id
 
@@ -283,58 +362,56 @@ class ConsiliumCourier:
     # ------------------------------------------------------------------ #
 
     def _enqueue_pending_agent(self, participant: str) -> None:
-        if participant in self._pending_membership:
+        if participant in self._in_flight:
+            self._needs_requeue.add(participant)
             return
-        self._pending_agents.append(participant)
-        self._pending_membership.add(participant)
+        self._pending.setdefault(participant, None)
 
     def _prioritize_agent(self, participant: str) -> None:
         """Move participant to the front of pending queue."""
-        if participant not in self._pending_membership:
+        if participant not in self._pending:
+            # In flight: keep the priority for when its turn ends and it is requeued
+            if participant in self._needs_requeue:
+                self._priority_requeue.add(participant)
+                self._logger.debug("Will requeue %s at the front after its turn", participant)
             return  # Not in queue
 
-        # Remove from current position
-        try:
-            self._pending_agents.remove(participant)
-        except ValueError:
-            return
-
-        # Insert at the front
-        self._pending_agents.appendleft(participant)
+        self._pending.move_to_end(participant, last=False)
         self._logger.debug("Moved %s to front of queue", participant)
 
     def _pop_pending_agent(self) -> str | None:
-        if not self._pending_agents:
+        if not self._pending:
             return None
-        participant = self._pending_agents.popleft()
-        self._pending_membership.discard(participant)
+        participant, _ = self._pending.popitem(last=False)
         return participant
 
     def _purge_participant(self, participant: str) -> None:
-        self._pending_membership.discard(participant)
-        try:
-            while True:
-                self._pending_agents.remove(participant)
-        except ValueError:
-            pass
-        self._debug_state(f"purge {participant}")
+        self._pending.pop(participant, None)
+        self._needs_requeue.discard(participant)
+        self._priority_requeue.discard(participant)
+        if self._debug_enabled:
+            self._debug_state(f"purge {participant}")
 
     def mark_participant_disabled(self, participant: str) -> None:
         """Public API: remove participant from routing state."""
         if participant == 'User':
             return
+        self._membership_version += 1
         self._purge_participant(participant)
 
     def mark_participant_enabled(self, participant: str) -> None:
         """Public API: ensure participant state is registered after enabling."""
         if participant == 'User':
             return
+        self._membership_version += 1
         self._ensure_participant_registered(participant)
-        self._purge_participant(participant)
+        # Drop any stale slot; re-add at the back only if there is something unseen
+        self._pending.pop(participant, None)
         latest_id = self._journal[-1].id if self._journal else 0
-        if self._last_seen.get(participant, 0) < latest_id:
+        if self._last_seen[participant] < latest_id:
             self._enqueue_pending_agent(participant)
-        self._debug_state(f"enabled {participant}")
+        if self._debug_enabled:
+            self._debug_state(f"enabled {participant}")
 
     def _deliver_to_user(self) -> None:
         if not self._journal:
@@ -362,9 +439,29 @@ class ConsiliumCourier:
         agent_config: dict[str, Any],
         context: list[JournalEntry],
         init_flag: bool,
+    ) -> None:
+        self._in_flight.add(agent_name)
+        try:
+            await self._dispatch_agent_once(agent_name, agent_config, context, init_flag)
+        finally:
+            self._in_flight.discard(agent_name)
+            if agent_name in self._needs_requeue:
+                self._needs_requeue.discard(agent_name)
+                self._enqueue_pending_agent(agent_name)
+                if agent_name in self._priority_requeue:
+                    self._priority_requeue.discard(agent_name)
+                    self._prioritize_agent(agent_name)
+                self._logger.debug("Requeued %s for messages batched during its turn", agent_name)
+
+    async def _dispatch_agent_once(
+        self,
+        agent_name: str,
+        agent_config: dict[str, Any],
+        context: list[JournalEntry],
+        init_flag: bool,
     ) -> None:
         display_name = self._hooks.get_display_name(agent_name)
-        formatted = self._format_context(context)
+        formatted = _LazyContext(self, context)
 
         self._hooks.add_status(STATUS_PROCESSING.format(display_name=display_name))
         self._logger.trace("%s thinking with context:\n%s", agent_name, formatted)
@@ -395,16 +492,14 @@ class ConsiliumCourier:
         if response_message.text:
             self._logger.debug("Queued response from %s: %s", agent_name, response_message.text[:60])
             self.enqueue_message(response_message)
-            self._debug_state(f"response queued from {agent_name}")
+            if self._debug_enabled:
+                self._debug_state(f"response queued from {agent_name}")
         else:
             self._hooks.add_status(STATUS_EMPTY_RESPONSE.format(display_name=display_name))
 
     def _format_context(self, context: list[JournalEntry]) -> str:
-        lines: list[str] = []
-        for entry in context:
-            lines.extend(self._format_entry(entry))
-            lines.append("")
-        return "\n".join(lines).rstrip()
+        # rstrip only copies when the last entry ends in whitespace
+        return "\n\n".join(map(self._format_entry, context)).rstrip()
 
     def _make_agent_courier_message(self, agent_name: str, response: Any) -> CourierMessage | None:
         if response is None:
@@ -458,43 +553,39 @@ class ConsiliumCourier:
         if not text:
             return None, ""
 
-        length = len(text)
-        idx = 0
-
-        while idx < length and text[idx].isspace():
-            idx += 1
-
+        idx = _WS_RE.match(text).end()
         prefix = text[:idx]
         fence_close_idx: int | None = None
 
         if text.startswith("```", idx):
-            fence_end = text.find("\n", idx)
-            if fence_end == -1:
+            fence = _JSON_FENCE_RE.match(text, idx)
+            if fence is None:
                 return None, text
-            fence_tag = text[idx + 3:fence_end].strip().lower()
-            if fence_tag in ("", "json", "application/json", "json5"):
-                idx = fence_end + 1
-                fence_close_idx = text.find("```", idx)
-                if fence_close_idx == -1:
-                    return None, text
-            else:
+            idx = fence.end()
+            fence_close_idx = text.find("```", idx)
+            if fence_close_idx == -1:
                 return None, text
 
-        while idx < length and text[idx].isspace():
-            idx += 1
-
-        if idx >= length or text[idx] != '{':
+        idx = _WS_RE.match(text, idx).end()
+        if idx >= len(text) or text[idx] != '{':
             return None, text
 
-        closing_index_relative = self._find_matching_brace(text[idx:])
-        if closing_index_relative is None:
-            self._logger.debug("Failed to locate JSON header terminator in response")
-            return None, text
+        try:
+            header, body_start = _JSON_DECODER.raw_decode(text, idx)
+        except json.JSONDecodeError:
+            # Slow path: locate the closing brace by hand and tolerate trailing commas
+            closing_index_relative = self._find_matching_brace(text[idx:])
+            if closing_index_relative is None:
+                self._logger.debug("Failed to locate JSON header terminator in response")
+                return None, text
 
-        closing_index = idx + closing_index_relative
-        raw_header = text[idx:closing_index + 1]
+            body_start = idx + closing_index_relative + 1
+            raw_header = text[idx:body_start]
+            header = self._parse_json_header(raw_header)
+            if header is None:
+                self._logger.debug("Invalid JSON header in agent response: %s", raw_header)
+                return None, text
 
-        body_start = closing_index + 1
         if fence_close_idx is not None and body_start <= fence_close_idx:
             body_start = fence_close_idx + 3
 
@@ -502,11 +593,6 @@ class ConsiliumCourier:
         if body:
             body = body.lstrip("\r\n")
 
-        header = self._parse_json_header(raw_header)
-        if header is None:
-            self._logger.debug("Invalid JSON header in agent response: %s", raw_header)
-            return None, text
-
         return header, prefix + body
 
     @staticmethod
@@ -553,34 +639,7 @@ class ConsiliumCourier:
 
     @staticmethod
     def _strip_trailing_commas(payload: str) -> str:
-        result: list[str] = []
-        in_string = False
-        escape = False
-
-        for char in payload:
-            result.append(char)
-
-            if in_string:
-                if escape:
-                    escape = False
-                elif char == '\\':
-                    escape = True
-                elif char == '"':
-                    in_string = False
-                continue
-
-            if char == '"':
-                in_string = True
-                continue
-
-            if char in ('}', ']'):
-                idx = len(result) - 2
-                while idx >= 0 and result[idx].isspace():
-                    idx -= 1
-                if idx >= 0 and result[idx] == ',':
-                    del result[idx]
-
-        return ''.join(result)
+        return _TRAILING_COMMA_RE.sub(_keep_string_or_closer, payload)
 
     @staticmethod
     def _coerce_replyto(value: Any) -> int | str | None:
@@ -626,36 +685,21 @@ class ConsiliumCourier:
             True if message has metadata={'status': 'secret'}
 
         Implementation:
-            O(n) linear search through journal
-            (acceptable for typical journal size <1000 messages)
+            O(1) lookup in the id -> entry index kept alongside the journal
         """
-        for entry in self._journal:
-            if entry.id == msg_id:
-                return entry.metadata.get('status') == 'secret' if entry.metadata else False
-        return False
+        entry = self._entries_by_id.get(msg_id)
+        return bool(entry and entry.metadata and entry.metadata.get('status') == 'secret')
 
     # ------------------------------------------------------------------ #
     # Formatting helpers
     # ------------------------------------------------------------------ #
 
-    def _format_entry(self, entry: JournalEntry) -> list[str]:
+    def _format_entry(self, entry: JournalEntry) -> str:
         author_display = self._display_name(entry.author)
         targets = self._resolve_targets(entry)
         to_line = ", ".join(targets) if targets else "all"
-        header = CHAT_HEADER_TEMPLATE.format(
-            id=entry.id,
-            msd_id=entry.id,
-            author=author_display,
-            targets=to_line,
-        ).rstrip()
-        header_lines = header.splitlines()
-        lower_header = [line.strip().lower() for line in header_lines]
-        if not any(line.startswith("from:") for line in lower_header):
-            header_lines.append(f"from: {author_display}")
-        if not any(line.startswith("to:") for line in lower_header):
-            header_lines.append(f"to: {to_line}")
-        lines = header_lines + ["", entry.text]
-        return lines
+        header = CHAT_HEADER_TEMPLATE % entry.id
+        return f"{header}\nfrom: {author_display}\nto: {to_line}\n\n{entry.text}"
 
     def _display_name(self, participant: str) -> str:
         return self._hooks.get_display_name(participant)
@@ -670,10 +714,13 @@ class ConsiliumCourier:
                 if collected:
                     return collected
 
+        # Most entries mention nobody; skip the alias map and regex entirely
+        if '@' not in entry.text:
+            return []
+
         alias_map = self._build_alias_map()
         mentions: set[str] = set()
-        for match in re.finditer(r'@([^\s@]+)', entry.text):
-            token = match.group(1)
+        for token in _MENTION_RE.findall(entry.text):
             normalized = self._normalize_alias(token)
             if not normalized:
                 continue
@@ -694,6 +741,10 @@ class ConsiliumCourier:
         ]
 
     def _build_alias_map(self) -> dict[str, str]:
+        cache_key = self._membership_key()
+        if self._alias_map_cache is not None and self._alias_map_key == cache_key:
+            return self._alias_map_cache
+
         alias_map: dict[str, str] = {
             "all": "__all__",
             "everyone": "__all__",
@@ -710,25 +761,27 @@ class ConsiliumCourier:
                 normalized = self._normalize_alias(alias)
                 if normalized:
                     alias_map[normalized] = participant
+        self._alias_map_cache = alias_map
+        self._alias_map_key = cache_key
         return alias_map
 
     @staticmethod
+    @lru_cache(maxsize=1024)
     def _normalize_alias(value: str) -> str:
-        return re.sub(r'[^0-9a-z]+', '', value.casefold())
+        folded = value.casefold()
+        if folded.isascii():
+            return folded.translate(_ASCII_NON_ALNUM_DROP)
+        return _NON_ALNUM_RE.sub('', folded)
 
     def _debug_state(self, note: str) -> None:
-        if not self._logger.isEnabledFor(logging.DEBUG):
-            return
-        pending_snapshot = list(self._pending_agents)
-        last_seen_snapshot = dict(sorted(self._last_seen.items()))
-        journal_tail = [entry.id for entry in self._journal[-5:]]
+        """Log a courier state snapshot; callers gate on self._debug_enabled."""
+        # Live containers are formatted synchronously by the handler; no sorted copies
         self._logger.debug(
-            "Courier state [%s]: pending=%s membership=%s last_seen=%s journal_tail=%s next_id=%d",
+            "Courier state [%s]: pending=%s last_seen=%s journal_tail=%s next_id=%d",
             note,
-            pending_snapshot,
-            sorted(self._pending_membership),
-            last_seen_snapshot,
-            journal_tail,
+            list(self._pending),
+            self._last_seen,
+            [entry.id for entry in self._journal[-5:]],
             self._next_journal_id,
         )
 
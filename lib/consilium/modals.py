@@ -8,10 +8,9 @@ Licensed under Artel Team Non-Commercial License
 """
 
 import asyncio
-import hashlib
 import logging
-import re
-import shutil
+import os
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, Iterable
 
@@ -26,7 +25,7 @@ from textual.css.query import NoMatches
 
 from .constants import (
     STATUS_PROMPT_SAVED, STATUS_EDITING_CANCELLED,
-    STATUS_CREATING_PROMPTS_TOML, STATUS_UNKNOWN_AGENT,
+    STATUS_CREATING_PROMPTS_TOML, STATUS_UNKNOWN_AGENT, PROMPTS_TOML_PATH,
     STATUS_PROMPT_SELECTION_FAILED, STATUS_EDIT_CANCELLED_RU,
     STATUS_PROMPT_EMPTY_RU, STATUS_PROMPT_SAVED_RU,
     STATUS_ROLE_CREATED, STATUS_ROLE_SAVED,
@@ -35,18 +34,60 @@ from .constants import (
     ERROR_PROMPT_SELECT, ERROR_PROMPT_MENU, ERROR_ROLE_MENU,
     ERROR_ROLE_EDITOR, ERROR_ROLE_CREATE,
     TEXT_PROMPT_SAVED, STATUS_AGENT_PARTICIPATION,
-    SYSTEM_PROMPT_PERIOD,
 )
 from .utils import load_prompts_from_config
 
-# TOML validation (if available)
-try:
-    import tomllib
-except ModuleNotFoundError:
+@lru_cache(maxsize=1)
+def _get_toml_loads():
+    """TOML parser for validation, resolved on first save; None if none is installed.
+
+    Prefers the compiled parsers, then tomllib/tomli.
+    """
     try:
-        import tomli as tomllib
+        from rtoml import loads
     except ModuleNotFoundError:
-        tomllib = None
+        try:
+            from pytomlpp import loads
+        except ModuleNotFoundError:
+            try:
+                from tomllib import loads
+            except ModuleNotFoundError:
+                try:
+                    from tomli import loads
+                except ModuleNotFoundError:
+                    loads = None
+    return loads
+
+
+# Triple quotes inside a prompt would close the TOML multi-line string early
+_ESCAPED_TRIPLE_QUOTE = '\\"\\"\\"'
+
+# prompts.toml layout written by the prompt editor; %s slots take the escaped init/system texts
+_PROMPTS_TOML_TEMPLATE = (
+    "# Consilium Agent Prompts Configuration\n"
+    "# Edit these prompts to customize agent behavior\n\n"
+    "[prompts]\n"
+    "# Initial prompt - shown only on first agent introduction\n"
+    'init = """\n%s\n"""\n\n'
+    "# Service prompt - used for all subsequent messages\n"
+    'system = """\n%s\n"""\n'
+)
+
+
+@lru_cache(maxsize=4)
+def _load_prompts_cached(path: str, mtime_ns: int) -> tuple[str, str]:
+    """load_prompts_from_config() memoized on the file's identity and mtime."""
+    return load_prompts_from_config()
+
+
+def _load_prompts_for_editor(config_path: Path) -> tuple[str, str]:
+    try:
+        mtime_ns = config_path.stat().st_mtime_ns
+    except OSError:
+        # Missing file: let the loader create defaults, uncached
+        return load_prompts_from_config()
+    return _load_prompts_cached(str(config_path), mtime_ns)
+
 
 class PromptEditorScreen(ModalScreen[bool]):
     """Modal screen for editing prompts.toml"""
@@ -114,30 +155,26 @@ class PromptEditorScreen(ModalScreen[bool]):
         super().__init__()
         self.config_path = config_path
         self.logger = logging.getLogger('PromptEditor')
-        init_prompt, system_prompt = load_prompts_from_config()
+        self._saving = False
+        init_prompt, system_prompt = _load_prompts_for_editor(config_path)
         self.init_prompt = init_prompt.strip()
         self.system_prompt = system_prompt.strip()
 
     def compose(self) -> ComposeResult:
         """Create editor UI"""
+        # Editor references kept so saving skips query_one()
+        self._init_editor = TextArea(self.init_prompt, id="init-editor", language="text")
+        self._system_editor = TextArea(self.system_prompt, id="system-editor", language="text")
         with Container(id="editor-container"):
             yield Static("📝 Prompt editor ~/.consilium/prompts.toml", id="editor-title")
 
             with Container(id="editor-body"):
                 with Container(id="init-pane", classes="editor-pane"):
                     yield Static("INIT PROMPT", classes="editor-label")
-                    yield TextArea(
-                        self.init_prompt,
-                        id="init-editor",
-                        language="text"
-                    )
+                    yield self._init_editor
                 with Container(id="system-pane", classes="editor-pane"):
                     yield Static("SERVICE PROMPT", classes="editor-label")
-                    yield TextArea(
-                        self.system_prompt,
-                        id="system-editor",
-                        language="text"
-                    )
+                    yield self._system_editor
 
             yield Static(
                 "Changes are saved for both prompts immediately. Restart the application to apply new texts.",
@@ -148,58 +185,101 @@ class PromptEditorScreen(ModalScreen[bool]):
                 yield Button("💾 Save (Ctrl+S)", variant="primary", id="save-btn")
                 yield Button("❌ Cancel (Esc)", variant="default", id="cancel-btn")
 
-    def on_button_pressed(self, event: Button.Pressed) -> None:
+    async def on_button_pressed(self, event: Button.Pressed) -> None:
         """Handle button clicks"""
         if event.button.id == "save-btn":
-            self.action_save()
+            await self.action_save()
         elif event.button.id == "cancel-btn":
             self.action_cancel()
 
-    def action_save(self) -> None:
+    async def action_save(self) -> None:
         """Save edited content"""
-        init_editor = self.query_one("#init-editor", TextArea)
-        system_editor = self.query_one("#system-editor", TextArea)
-        init_text = init_editor.text.strip()
-        system_text = system_editor.text.strip()
+        if self._saving:
+            return
+        init_text = self._init_editor.text.strip()
+        system_text = self._system_editor.text.strip()
+        # Unchanged content is detected against the on-disk bytes in the worker;
+        # the loaded texts may be defaults standing in for a missing/broken file
         toml_content = self._build_prompts_toml(init_text, system_text)
 
+        # Validation and disk I/O run in a worker thread so the UI keeps redrawing
+        self._saving = True
+        try:
+            error = await asyncio.to_thread(self._validate_and_write, toml_content)
+        finally:
+            self._saving = False
+
+        if error is not None:
+            if error:
+                self.app.add_status(error)
+            self.app.bell()
+            return
+
+        _load_prompts_cached.cache_clear()
+
+        # Update prompts in app memory immediately (no restart needed!)
+        self.app.init_prompt = init_text
+        self.app.system_prompt = system_text
+        self.app._invalidate_prompt_prefixes()
+        self.logger.info("Updated prompts in memory")
+
+        self.dismiss(True)
+
+    def _validate_and_write(self, toml_content: str) -> str | None:
+        """Validate and persist prompts.toml; return a status message ('' for none) on failure."""
+        import shutil
+
         # Validate TOML before writing to disk (if parser available)
-        if tomllib is not None:
+        toml_loads = _get_toml_loads()
+        if toml_loads is not None:
             try:
-                tomllib.loads(toml_content)
+                toml_loads(toml_content)
             except Exception as parse_error:
-                message = f"⚠️ TOML syntax error: {parse_error}"
                 self.logger.exception("Prompt validation failed")
-                self.app.add_status(message)
-                self.app.bell()
-                return
+                return f"⚠️ TOML syntax error: {parse_error}"
 
+        new_bytes = toml_content.encode('utf-8')
+        tmp_path = self.config_path.with_suffix('.toml.tmp')
         try:
-            # Backup original using copy to avoid losing source on write failure
+            # Identical bytes on disk (another editor, stale cache): no backup, no write
+            try:
+                if self.config_path.read_bytes() == new_bytes:
+                    self.logger.debug("prompts.toml already up to date; skipping write")
+                    return None
+            except FileNotFoundError:
+                pass
+
+            # Write the new content next to the original; fsync is cheap off the event loop
+            with tmp_path.open('wb') as handle:
+                handle.write(new_bytes)
+                handle.flush()
+                os.fsync(handle.fileno())
+
+            # Backup original: a hard link keeps the old inode without copying it,
+            # since os.replace() below swaps the name rather than rewriting in place
             backup_path = self.config_path.with_suffix('.toml.backup')
             if self.config_path.exists():
-                shutil.copy2(self.config_path, backup_path)
+                backup_path.unlink(missing_ok=True)
+                try:
+                    os.link(self.config_path, backup_path)
+                except OSError:
+                    shutil.copy2(self.config_path, backup_path)
                 self.logger.info(f"Created backup: {backup_path}")
 
-            # Save new content
-            self.config_path.write_text(toml_content, encoding='utf-8')
+            # Atomic swap: readers see either the old or the new file, never a torn one
+            os.replace(tmp_path, self.config_path)
             self.logger.info(f"Saved prompts to {self.config_path}")
-
-            # Update prompts in app memory immediately (no restart needed!)
-            self.app.init_prompt = init_text
-            self.app.system_prompt = system_text
-            self.logger.info("Updated prompts in memory")
-
-            self.dismiss(True)
         except Exception:
             self.logger.exception("Failed to save prompts")
-            self.app.bell()
+            tmp_path.unlink(missing_ok=True)
+            return ""
+        return None
 
     def action_cancel(self) -> None:
         """Cancel editing"""
         self.dismiss(False)
 
-    def on_key(self, event: events.Key) -> None:
+    async def on_key(self, event: events.Key) -> None:
         """Stop Escape and Ctrl+S from bubbling to parent app."""
         if event.key == "escape":
             event.stop()
@@ -209,27 +289,15 @@ class PromptEditorScreen(ModalScreen[bool]):
         elif event.key == "ctrl+s":
             event.stop()
             event.prevent_default()
-            self.action_save()
+            await self.action_save()
             return
 
     @staticmethod
     def _build_prompts_toml(init_text: str, system_text: str) -> str:
         """Assemble TOML string with provided prompt texts."""
-
-        def sanitize(value: str) -> str:
-            return value.replace('"""', '\\"\\"\\"')
-
-        init_block = sanitize(init_text)
-        system_block = sanitize(system_text)
-
-        return (
-            "# Consilium Agent Prompts Configuration\n"
-            "# Edit these prompts to customize agent behavior\n\n"
-            "[prompts]\n"
-            "# Initial prompt - shown only on first agent introduction\n"
-            f'init = """\n{init_block}\n"""\n\n'
-            "# Service prompt - used for all subsequent messages\n"
-            f'system = """\n{system_block}\n"""\n'
+        return _PROMPTS_TOML_TEMPLATE % (
+            init_text.replace('"""', _ESCAPED_TRIPLE_QUOTE),
+            system_text.replace('"""', _ESCAPED_TRIPLE_QUOTE),
         )
 
 
@@ -280,18 +348,20 @@ class PromptSelectionScreen(ModalScreen[str | None]):
         self.agents = agents
         self._mounted = False
 
-    def compose(self) -> ComposeResult:
-        options: list[Option] = [
+    @staticmethod
+    def _build_options(agents: Iterable[tuple[str, bool]]) -> list[Option]:
+        return [
             Option("General service prompt", id="general"),
+            *(
+                Option(f"{'*' if has_prompt else '-'} {agent_name}", id=f"agent:{agent_name}")
+                for agent_name, has_prompt in agents
+            ),
         ]
-        for agent_name, has_prompt in self.agents:
-            prefix = "*" if has_prompt else "-"
-            label = f"{prefix} {agent_name}"
-            options.append(Option(label, id=f"agent:{agent_name}"))
 
+    def compose(self) -> ComposeResult:
         with Container(id="prompt-menu"):
             yield Static("Select prompt", id="prompt-menu-title")
-            yield OptionList(*options, id="prompt-options")
+            yield OptionList(*self._build_options(self.agents), id="prompt-options")
             yield Static("(*) has custom prompt, (-) uses general", id="prompt-menu-hint")
 
     def on_mount(self) -> None:
@@ -332,7 +402,7 @@ class PromptSelectionScreen(ModalScreen[str | None]):
 
     def _open_general_editor(self) -> None:
         """Open general prompt editor on top of this selection screen."""
-        config_path = Path.home() / ".consilium" / "prompts.toml"
+        config_path = PROMPTS_TOML_PATH
         if not config_path.exists():
             self.app.add_status(STATUS_CREATING_PROMPTS_TOML)
             load_prompts_from_config()
@@ -366,22 +436,13 @@ class PromptSelectionScreen(ModalScreen[str | None]):
                 )
                 return
 
-            agent_entries = [
-                (name, self.app.agent_prompt_exists(name))
-                for name in self.app.agents.keys()
-            ]
-
-            options: list[Option] = [
-                Option("General service prompt", id="general"),
-            ]
-            for agent_name, has_prompt in agent_entries:
-                prefix = "*" if has_prompt else "-"
-                label = f"{prefix} {agent_name}"
-                options.append(Option(label, id=f"agent:{agent_name}"))
-
-            option_list.clear_options()
-            for option in options:
-                option_list.add_option(option)
+            agent_entries = self.app.agent_prompt_entries()
+
+            # Rebuild only when an agent or its prompt file changed, and then in one batch
+            if agent_entries != self.agents:
+                self.agents = agent_entries
+                option_list.clear_options()
+                option_list.add_options(self._build_options(agent_entries))
             option_list.highlighted = 0
             option_list.focus()
             option_list.scroll_to_highlight()
@@ -489,9 +550,10 @@ class RoleNamePrompt(ModalScreen[str | None]):
         Binding("escape", "cancel", "Cancel"),
     ]
 
-    def __init__(self, existing_names: Iterable[str]):
+    def __init__(self, existing_names: frozenset[str]):
+        """existing_names must already be stripped and lowercased."""
         super().__init__()
-        self._existing = {name.strip().lower() for name in existing_names if name}
+        self._existing = existing_names
 
     def compose(self) -> ComposeResult:
         with Container(id="role-name-container"):
@@ -593,16 +655,20 @@ class RolePromptEditorScreen(ModalScreen[bool]):
         super().__init__()
         self.role_id = role_id
         self._role_name = ""
+        self._sync_pending = False
 
     def compose(self) -> ComposeResult:
+        # Widget references kept so keystroke handlers skip query_one()
+        self._text_area = TextArea("", id="role-prompt-area", language="text")
+        self._save_btn = Button("💾 Save (Ctrl+S)", id="save-role-btn", variant="primary")
         with Container(id="role-editor-container"):
             yield Static("Role prompt editor", id="role-editor-title")
             with Container(id="role-editor-body"):
-                yield TextArea("", id="role-prompt-area", language="text")
+                yield self._text_area
             with Horizontal(id="role-editor-actions"):
                 yield Button("⬅ Back (Esc)", id="cancel-role-btn")
                 yield Button("🗑 Delete", id="delete-role-btn", variant="error")
-                yield Button("💾 Save (Ctrl+S)", id="save-role-btn", variant="primary")
+                yield self._save_btn
 
     def on_mount(self) -> None:
         role = self.app.get_role(self.role_id)
@@ -616,7 +682,7 @@ class RolePromptEditorScreen(ModalScreen[bool]):
         title = self.query_one("#role-editor-title", Static)
         title.update(f"Role prompt: {role.name}")
 
-        text_area = self.query_one("#role-prompt-area", TextArea)
+        text_area = self._text_area
         prompt_text = self.app.load_role_prompt(self.role_id)
         text_area.load_text(prompt_text)
         self.call_later(text_area.focus)
@@ -630,17 +696,20 @@ class RolePromptEditorScreen(ModalScreen[bool]):
         elif event.button.id == "save-role-btn":
             self.action_save()
 
-    def on_input_changed(self, _event: Input.Changed) -> None:
-        # No inputs in this screen, provided for completeness.
-        pass
-
     def on_text_area_changed(self, _event: TextArea.Changed) -> None:
+        # A paste can deliver many Changed events per frame; sync once after refresh
+        if self._sync_pending:
+            return
+        self._sync_pending = True
+        self.call_after_refresh(self._flush_save_button_sync)
+
+    def _flush_save_button_sync(self) -> None:
+        self._sync_pending = False
         self._sync_save_button()
 
     def _sync_save_button(self) -> None:
-        text_area = self.query_one("#role-prompt-area", TextArea)
-        save_btn = self.query_one("#save-role-btn", Button)
-        save_btn.disabled = not text_area.text.strip()
+        text = self._text_area.text
+        self._save_btn.disabled = not text or text.isspace()
 
     def action_cancel(self) -> None:
         self.dismiss(False)
@@ -671,8 +740,7 @@ class RolePromptEditorScreen(ModalScreen[bool]):
             self.app.bell()
 
     def action_save(self) -> None:
-        text_area = self.query_one("#role-prompt-area", TextArea)
-        text = text_area.text.strip()
+        text = self._text_area.text.strip()
         if not text:
             self.app.add_status(STATUS_PROMPT_EMPTY_RU)
             self.app.bell()
@@ -763,6 +831,8 @@ class RoleSelectionScreen(ModalScreen[None]):
         options: list[Option] = [Option("Create a new role…", id="create")]
         for role in self.app.get_roles():
             options.append(Option(role.name, id=f"role:{role.role_id}"))
+        # id -> index, kept with the options so refreshes restore focus by lookup
+        self._option_index = {option.id: idx for idx, option in enumerate(options)}
         return options
 
     def _refresh_options(self) -> None:
@@ -775,16 +845,11 @@ class RoleSelectionScreen(ModalScreen[None]):
 
         options = self._build_options()
         option_list.clear_options()
-        for option in options:
-            option_list.add_option(option)
+        option_list.add_options(options)
 
         target_index = 0
         if self._pending_focus:
-            target_id = f"role:{self._pending_focus}"
-            for idx, option in enumerate(option_list.options):
-                if option.id == target_id:
-                    target_index = idx
-                    break
+            target_index = self._option_index.get(f"role:{self._pending_focus}", 0)
             self._pending_focus = None
 
         option_list.highlighted = target_index
@@ -792,7 +857,7 @@ class RoleSelectionScreen(ModalScreen[None]):
         option_list.scroll_to_highlight()
 
     def _create_role(self) -> None:
-        existing_names = [role.name for role in self.app.get_roles()]
+        existing_names = self.app.role_names_normalized
 
         def on_name_selected(name: str | None) -> None:
             if not name:
@@ -933,21 +998,25 @@ class AgentPromptEditorScreen(ModalScreen[bool]):
     def __init__(self, agent_name: str):
         super().__init__()
         self.agent_name = agent_name
+        self._sync_pending = False
 
     def compose(self) -> ComposeResult:
+        # Widget references kept so keystroke handlers skip query_one()
+        self._text_area = TextArea("", id="agent-text", language="text")
+        self._save_btn = Button("💾 Save (Ctrl+S)", id="save-btn", variant="primary")
         with Container(id="agent-editor-container"):
             yield Static(f"Prompt editor for {self.agent_name}", id="agent-editor-title")
             with Container(id="agent-editor-body"):
-                yield TextArea("", id="agent-text", language="text")
+                yield self._text_area
             yield Static("", id="agent-editor-hint")
             with Horizontal(id="agent-editor-actions"):
                 yield Button("⬅ Back (Esc)", id="cancel-btn")
-                yield Button("💾 Save (Ctrl+S)", id="save-btn", variant="primary")
+                yield self._save_btn
 
     def on_mount(self) -> None:
         try:
             self.app.logger.trace("AgentPromptEditorScreen:on_mount agent=%s", self.agent_name)
-            text_area = self.query_one("#agent-text", TextArea)
+            text_area = self._text_area
             hint = self.query_one("#agent-editor-hint", Static)
 
             prompt_text = self.app._load_agent_prompt_from_disk(self.agent_name)
@@ -1001,25 +1070,31 @@ class AgentPromptEditorScreen(ModalScreen[bool]):
         elif event.key == "tab":
             event.stop()
             event.prevent_default()
-            text_area = self.query_one("#agent-text", TextArea)
-            text_area.insert("\t")
+            self._text_area.insert("\t")
             return
 
     def on_text_area_changed(self, _event: TextArea.Changed) -> None:
+        # A paste can deliver many Changed events per frame; sync once after refresh
+        if self._sync_pending:
+            return
+        self._sync_pending = True
+        self.call_after_refresh(self._flush_save_button_sync)
+
+    def _flush_save_button_sync(self) -> None:
+        self._sync_pending = False
         self._sync_save_button()
 
     def _sync_save_button(self) -> None:
         try:
-            text_area = self.query_one("#agent-text", TextArea)
-            save_btn = self.query_one("#save-btn", Button)
-            save_btn.disabled = not text_area.text.strip()
+            text = self._text_area.text
+            save_btn = self._save_btn
+            save_btn.disabled = not text or text.isspace()
             self.app.logger.trace("AgentPromptEditorScreen:save button state disabled=%s", save_btn.disabled)
         except Exception as exc:
             self.app.logger.error(f"AgentPromptEditorScreen:_sync_save_button error: {exc}", exc_info=True)
 
     def action_save(self) -> None:
-        text_area = self.query_one("#agent-text", TextArea)
-        text = text_area.text.strip()
+        text = self._text_area.text.strip()
         if not text:
             self.app.add_status(STATUS_PROMPT_EMPTY_RU)
             self.app.bell()
@@ -1122,7 +1197,7 @@ class SystemSettingsScreen(ModalScreen[None]):
 
     def on_mount(self) -> None:
         # Load current setting
-        current_period = getattr(self.app, 'system_prompt_period', SYSTEM_PROMPT_PERIOD)
+        current_period = self.app.system_prompt_period
 
         # Set value via call_later to avoid mount-time issues
         def _set_value():
@@ -1289,6 +1364,8 @@ class MembersSelectionScreen(ModalScreen[None]):
             status_icon = "🔊" if enabled else "🔇"
             label = f"{status_icon} - {avatar} {display} ({class_name})"
             options.append(Option(label, id=f"agent:{agent_id}"))
+        # id -> index, kept with the options so refreshes restore focus by lookup
+        self._option_index = {option.id: idx for idx, option in enumerate(options)}
         return options
 
     def _refresh_options(self) -> None:
@@ -1304,16 +1381,11 @@ class MembersSelectionScreen(ModalScreen[None]):
             current_id = option_list.options[current_index].id
         options = self._build_options()
         option_list.clear_options()
-        for option in options:
-            option_list.add_option(option)
+        option_list.add_options(options)
         default_focus = "create"
         target_id = self._pending_focus or current_id or default_focus
-        target_index = 0
-        for idx, option in enumerate(option_list.options):
-            if option.id == target_id:
-                target_index = idx
-                break
-        if option_list.options:
+        target_index = self._option_index.get(target_id, 0)
+        if options:
             option_list.highlighted = target_index
         option_list.focus()
         option_list.scroll_to_highlight()
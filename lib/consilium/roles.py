@@ -55,6 +55,7 @@ class RoleManager:
         self._defaults_root = self._resolve_defaults_root(defaults_root)
         self._requested_locale = self._normalize_locale(locale_hint)
         self._roles: dict[str, Role] = {}
+        self._normalized_names: Optional[frozenset[str]] = None
         self.reload()
 
     @property
@@ -64,6 +65,7 @@ class RoleManager:
     def reload(self) -> None:
         """Reload roles from disk."""
         self._roles.clear()
+        self._normalized_names = None
         for child in sorted(self._root.iterdir()):
             if not child.is_dir():
                 continue
@@ -78,6 +80,16 @@ class RoleManager:
     def get_role(self, role_id: str) -> Optional[Role]:
         return self._roles.get(role_id)
 
+    def normalized_names(self) -> frozenset[str]:
+        """Stripped, lowercased role names for duplicate checks; rebuilt only after changes."""
+        names = self._normalized_names
+        if names is None:
+            names = frozenset(
+                role.name.strip().lower() for role in self._roles.values() if role.name
+            )
+            self._normalized_names = names
+        return names
+
     def create_role(self, name: str) -> Role:
         """Create a new role with empty prompt."""
         role_id = uuid.uuid4().hex
@@ -88,6 +100,7 @@ class RoleManager:
         self._write_metadata(role, "")
 
         self._roles[role.role_id] = role
+        self._normalized_names = None
         return role
 
     def save_prompt(self, role_id: str, text: str) -> None:
@@ -133,6 +146,7 @@ class RoleManager:
             locale=role.locale,
         )
         self._roles[role_id] = updated
+        self._normalized_names = None
         self._write_metadata(updated)
 
     def delete_role(self, role_id: str) -> None:
@@ -152,6 +166,7 @@ class RoleManager:
 
         # Remove from cache
         self._roles.pop(role_id, None)
+        self._normalized_names = None
         logger.debug("Removed role %s from cache", role_id)
 
     def _load_role(self, directory: Path) -> Optional[Role]:
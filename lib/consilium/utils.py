@@ -9,14 +9,17 @@ Licensed under Artel Team Non-Commercial License
 
 import os
 import sys
+import json
+import asyncio
 import logging
+import contextlib
 import hashlib
 from pathlib import Path
 from datetime import datetime
 
 from rich.console import Console
 
-from .constants import DEFAULT_INIT_PROMPT, DEFAULT_SYSTEM_PROMPT
+from .constants import DEFAULT_INIT_PROMPT, DEFAULT_SYSTEM_PROMPT, PROMPTS_TOML_PATH
 
 # TOML library import (Python 3.11+ has tomllib built-in)
 try:
@@ -27,6 +30,52 @@ except ModuleNotFoundError:  # pragma: no cover - fallback for <3.11
     except ModuleNotFoundError:
         tomllib = None  # type: ignore
 
+# Task-free timeout context (Python 3.11+ has asyncio.timeout built-in)
+try:
+    from asyncio import timeout as async_timeout  # Python 3.11+
+except ImportError:  # pragma: no cover - fallback for <3.11
+    @contextlib.asynccontextmanager
+    async def async_timeout(delay: float):
+        """Cancel the current task after ``delay`` seconds and raise TimeoutError."""
+        task = asyncio.current_task()
+        expired = False
+
+        def _expire() -> None:
+            nonlocal expired
+            expired = True
+            task.cancel()
+
+        handle = asyncio.get_running_loop().call_later(delay, _expire)
+        try:
+            yield
+        except asyncio.CancelledError:
+            if expired:
+                raise asyncio.TimeoutError from None
+            raise
+        finally:
+            handle.cancel()
+
+# Fast JSON for streamed CLI events (orjson is optional)
+try:
+    import orjson
+except ModuleNotFoundError:  # pragma: no cover - stdlib fallback
+    orjson = None  # type: ignore
+
+if orjson is not None:
+    # orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers keep catching the latter
+    json_loads = orjson.loads
+
+    def json_dumps(obj) -> str:
+        """Serialize to a UTF-8 JSON string (non-ASCII kept as-is)."""
+        return orjson.dumps(obj).decode('utf-8')
+else:  # pragma: no cover - stdlib fallback
+    json_loads = json.loads
+
+    def json_dumps(obj) -> str:
+        """Serialize to a UTF-8 JSON string (non-ASCII kept as-is)."""
+        return json.dumps(obj, ensure_ascii=False)
+
+
 
 # ============================================================================
 # LOGGING SETUP
@@ -41,11 +90,13 @@ LOG_LEVELS = {
     'CRITICAL': 50,   # Critical failures only
 }
 
+TRACE_LEVEL = LOG_LEVELS['TRACE']
+
 _STDERR_TRACE_FLAG = os.environ.get("CONSILIUM_STDERR_TRACE", "").strip().lower()
 STDERR_TRACE_ENABLED = _STDERR_TRACE_FLAG not in {"", "0", "false", "no", "off"}
 
 # Add TRACE level to logging
-logging.addLevelName(5, 'TRACE')
+logging.addLevelName(TRACE_LEVEL, 'TRACE')
 
 
 def setup_logging():
@@ -107,8 +158,8 @@ def setup_logging():
 
     # TRACE method
     def trace(self, message, *args, **kwargs):
-        if self.isEnabledFor(5):
-            self._log(5, message, args, **kwargs)
+        if self.isEnabledFor(TRACE_LEVEL):
+            self._log(TRACE_LEVEL, message, args, **kwargs)
 
     if not hasattr(logging.Logger, "trace"):
         logging.Logger.trace = trace  # type: ignore[attr-defined]
@@ -149,7 +200,7 @@ def load_prompts_from_config() -> tuple[str, str]:
         'system': DEFAULT_SYSTEM_PROMPT,
     }
 
-    config_path = Path.home() / ".consilium" / "prompts.toml"
+    config_path = PROMPTS_TOML_PATH
 
     if not config_path.exists():
         logger.info(f"Creating default prompts.toml at {config_path}")
@@ -217,4 +268,4 @@ logger.info("=" * 70)
 # Load prompts
 INIT_PROMPT, SYSTEM_PROMPT = load_prompts_from_config()
 
-__all__ = ['setup_logging', 'load_prompts_from_config', 'LOG_LEVELS', 'INIT_PROMPT', 'SYSTEM_PROMPT', 'logger', 'log_file_path']
+__all__ = ['setup_logging', 'load_prompts_from_config', 'LOG_LEVELS', 'TRACE_LEVEL', 'async_timeout', 'json_loads', 'json_dumps', 'INIT_PROMPT', 'SYSTEM_PROMPT', 'logger', 'log_file_path']
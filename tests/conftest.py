@@ -0,0 +1,8 @@
+"""Make the in-tree ``consilium`` package importable for the test suite."""
+
+import sys
+from pathlib import Path
+
+LIB_DIR = Path(__file__).resolve().parent.parent / "lib"
+if str(LIB_DIR) not in sys.path:
+    sys.path.insert(0, str(LIB_DIR))
@@ -0,0 +1,91 @@
+"""Courier pending-queue ordering around agents that are still in flight."""
+
+import asyncio
+import logging
+
+from consilium.courier import ConsiliumCourier, CourierHooks, CourierMessage
+
+
+class _TraceLogger(logging.Logger):
+    """The app installs Logger.trace in setup_logging(); tests don't run that."""
+
+    def trace(self, message, *args, **kwargs):
+        pass
+
+
+def _make_courier(run_backend) -> ConsiliumCourier:
+    async def allow_step(_agent: str) -> bool:
+        return True
+
+    hooks = CourierHooks(
+        add_status=lambda _text: None,
+        publish_entry=lambda _entry, _is_error: None,
+        is_shutting_down=lambda: False,
+        is_interrupt_requested=lambda: False,
+        wait_for_step_permission=allow_step,
+        is_step_mode_enabled=lambda: False,
+        get_display_name=lambda name: name,
+        is_silent_response_text=lambda _text: False,
+        run_backend=run_backend,
+        get_agents_version=lambda: 0,
+    )
+    agents = {'Alpha': {'enabled': True}, 'Beta': {'enabled': True}}
+    return ConsiliumCourier(agents, hooks, _TraceLogger("test.courier"))
+
+
+def test_mention_while_in_flight_requeues_target_first():
+    async def scenario() -> list[tuple[str, str]]:
+        calls: list[tuple[str, str]] = []
+        alpha_started = asyncio.Event()
+        release_alpha = asyncio.Event()
+
+        async def run_backend(agent, message, _is_init, _skip_log):
+            calls.append((agent, str(message)))
+            if len(calls) == 1:
+                alpha_started.set()
+                await release_alpha.wait()
+            return None  # stay silent so no replies are queued
+
+        courier = _make_courier(run_backend)
+        courier.enqueue_message(CourierMessage(author='User', text="hello all"))
+        drain = asyncio.create_task(courier.drain())
+
+        await alpha_started.wait()
+        # Beta is still waiting in the queue while Alpha's first turn is running
+        courier.enqueue_message(
+            CourierMessage(author='User', text="@Alpha one more", metadata={'mentions': ['Alpha']})
+        )
+        release_alpha.set()
+        await asyncio.wait_for(drain, timeout=5)
+        return calls
+
+    calls = asyncio.run(scenario())
+
+    assert [agent for agent, _ in calls] == ['Alpha', 'Alpha', 'Beta']
+    assert "one more" in calls[1][1]
+
+
+def test_unprioritized_message_while_in_flight_requeues_at_back():
+    async def scenario() -> list[str]:
+        calls: list[str] = []
+        alpha_started = asyncio.Event()
+        release_alpha = asyncio.Event()
+
+        async def run_backend(agent, _message, _is_init, _skip_log):
+            calls.append(agent)
+            if len(calls) == 1:
+                alpha_started.set()
+                await release_alpha.wait()
+            return None
+
+        courier = _make_courier(run_backend)
+        courier.enqueue_message(CourierMessage(author='User', text="hello all"))
+        drain = asyncio.create_task(courier.drain())
+
+        await alpha_started.wait()
+        courier.enqueue_message(CourierMessage(author='User', text="anyone?"))
+        release_alpha.set()
+        await asyncio.wait_for(drain, timeout=5)
+        return calls
+
+    assert asyncio.run(scenario()) == ['Alpha', 'Beta', 'Alpha']
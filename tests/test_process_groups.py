@@ -0,0 +1,104 @@
+"""Agent CLIs lead their own session; stopping them must take their children along."""
+
+import asyncio
+import logging
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("textual")
+
+from consilium.app import ConsiliumAgentTUI  # noqa: E402
+
+pytestmark = pytest.mark.skipif(not hasattr(os, "killpg"), reason="needs POSIX process groups")
+
+_HELPERS = (
+    "_stop_process_groups",
+    "_reap_killed_process",
+    "_signal_process_group",
+    "_terminate_process_group",
+    "_kill_process_group",
+    "_close_process_pipes",
+)
+
+# Borrow the process helpers without constructing the whole Textual app
+_Harness = type(
+    "_Harness",
+    (),
+    {name: ConsiliumAgentTUI.__dict__[name] for name in _HELPERS},
+)
+
+# The CLI stand-in: spawns a SIGTERM-ignoring grandchild that inherits stdout,
+# reports its PID, then idles. ``cli_ignores_term`` controls the CLI itself.
+_CLI_SCRIPT = """
+import signal, subprocess, sys, time
+if sys.argv[1] == "1":
+    signal.signal(signal.SIGTERM, signal.SIG_IGN)
+child = subprocess.Popen([sys.executable, "-c",
+    "import signal, time; signal.signal(signal.SIGTERM, signal.SIG_IGN); time.sleep(60)"])
+print(child.pid, flush=True)
+time.sleep(60)
+"""
+
+
+def _alive(pid: int) -> bool:
+    stat = Path(f"/proc/{pid}/stat")
+    if stat.parent.parent.is_dir() and Path("/proc/self").exists():
+        try:
+            # Field after "(comm)" is the state; a zombie is already dead
+            return stat.read_text().rsplit(")", 1)[1].split()[0] != "Z"
+        except (FileNotFoundError, ProcessLookupError):
+            return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    return True
+
+
+async def _spawn_cli(cli_ignores_term: bool):
+    process = await asyncio.create_subprocess_exec(
+        sys.executable, "-c", _CLI_SCRIPT, "1" if cli_ignores_term else "0",
+        stdout=asyncio.subprocess.PIPE,
+        start_new_session=True,
+    )
+    grandchild_pid = int((await process.stdout.readline()).decode())
+    return process, grandchild_pid
+
+
+async def _wait_gone(pid: int, timeout: float = 2.0) -> bool:
+    deadline = asyncio.get_running_loop().time() + timeout
+    while _alive(pid):
+        if asyncio.get_running_loop().time() > deadline:
+            return False
+        await asyncio.sleep(0.02)
+    return True
+
+
+@pytest.mark.parametrize(
+    "grace",
+    [
+        pytest.param(True, id="interrupt-or-soft-shutdown"),
+        pytest.param(False, id="hard-shutdown"),
+    ],
+)
+@pytest.mark.parametrize("cli_ignores_term", [True, False])
+def test_stop_process_groups_reaps_grandchildren(grace, cli_ignores_term):
+    """Both ESC interrupt and app shutdown stop CLIs via _stop_process_groups."""
+
+    async def scenario():
+        harness = _Harness()
+        harness.logger = logging.getLogger("test.process_groups")
+        process, grandchild_pid = await _spawn_cli(cli_ignores_term)
+        try:
+            async with asyncio.timeout(5):
+                await harness._stop_process_groups({process}, grace=grace)
+            assert process.returncode is not None
+            assert await _wait_gone(grandchild_pid)
+        finally:
+            if _alive(grandchild_pid):
+                os.kill(grandchild_pid, 9)
+
+    asyncio.run(scenario())